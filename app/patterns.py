@@ -0,0 +1,18 @@
+# app/patterns.py
+"""
+Compiled regular expressions shared by the app, compiled once at import.
+"""
+
+import re
+
+# A run of tags and whitespace collapses to one space, so both are handled in a
+# single pass over the text. A tag cannot contain "<": with stray "<"s and no
+# closing ">" the scan then stops at the next "<" instead of running to the end
+# of the string from every one of them (quadratic on long malformed bodies).
+TAGS_WS_RE = re.compile(r"(?:<[^<>]+>|\s)+")
+
+# Keywords containing these are matched with ILIKE rather than full-text search
+WILDCARD_RE = re.compile(r"[%_*]")
+
+# Post ids as the collector writes them: "<source>:<native id>", e.g. reddit:abc123
+POST_ID_RE = re.compile(r"[a-z]+:[A-Za-z0-9_]+")
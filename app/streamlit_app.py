@@ -4,7 +4,8 @@
 import os
 import sys
 import time
-import re
+import hashlib
+import json
 from dotenv import load_dotenv
 
 # Load .env file at the very beginning
@@ -14,24 +15,36 @@ from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 import streamlit as st
-import plotly.express as px
-from supabase import create_client, Client
-from sklearn.feature_extraction.text import CountVectorizer
-from io import StringIO
+from supabase import create_client, Client, ClientOptions
+from io import BytesIO
 
 # local utils
-from utils import pretty_time_ago
+from utils import (
+    pretty_time_ago,
+    m4_downsample,
+    strip_html_tags,
+    dequantize_int8,
+    load_css,
+    post_card_text,
+)
+from patterns import WILDCARD_RE, POST_ID_RE
 
 # Allow importing project modules (collector) when running via Streamlit
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-try:
-    # Directly call the collector from the UI when keyword is submitted
-    from collector.reddit_collector import fetch_and_store as collect_reddit
-except Exception as _e:
-    collect_reddit = None  # Fallback if not available; we'll guard usage
+
+def load_collector():
+    """Import the collector on demand; it pulls in sentence-transformers and NLTK."""
+    try:
+        # Directly call the collector from the UI when keyword is submitted
+        from collector.reddit_collector import fetch_and_store
+
+        return fetch_and_store
+    except Exception:
+        return None  # Fallback if not available; we'll guard usage
+
 
 # ---- configure ----
 st.set_page_config(page_title="Trenddit — Prototype", layout="wide")
@@ -42,7 +55,101 @@ if not SUPABASE_URL or not SUPABASE_KEY:
     st.error("Missing SUPABASE_URL or SUPABASE_KEY in environment. See README.")
     st.stop()
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+@st.cache_resource
+def get_supabase_client() -> Client:
+    """Shared Supabase client for data queries, reused across reruns.
+
+    Keeping one client per process lets the underlying HTTP session (and its
+    connection pool) survive Streamlit reruns instead of being rebuilt each time.
+    """
+    # bounded PostgREST timeout so a stuck query can't hang a rerun (or the
+    # auto-refresh fragment) indefinitely
+    return create_client(
+        SUPABASE_URL,
+        SUPABASE_KEY,
+        options=ClientOptions(postgrest_client_timeout=10),
+    )
+
+
+def get_auth_client() -> Client:
+    """Per-session Supabase client used for auth calls.
+
+    Auth state (the signed-in session) lives on the client object, so it must not
+    be shared between browser sessions like the cached data client.
+    """
+    if "auth_client" not in st.session_state:
+        st.session_state.auth_client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    return st.session_state.auth_client
+
+
+# orjson (optional) encodes and decodes the cached query payloads several times
+# faster than the stdlib; both produce the same JSON
+try:
+    import orjson
+
+    _json_loads, _json_dumps = orjson.loads, orjson.dumps
+except ImportError:
+    _json_loads, _json_dumps = json.loads, json.dumps
+
+
+@st.cache_resource
+def get_redis():
+    """Optional Redis client shared by every app process, configured by REDIS_URL.
+
+    Returns None when REDIS_URL is unset or the redis package is missing; the
+    per-process st.cache_data caches then work on their own.
+    """
+    url = os.getenv("REDIS_URL")
+    if not url:
+        return None
+    try:
+        import redis
+    except ImportError:
+        return None
+    # short timeouts: a slow cache must never be slower than the query itself
+    return redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+
+
+def shared_cache(namespace, key_parts, ttl, load):
+    """
+    Second cache tier behind st.cache_data: look the result up in Redis, and on
+    a miss call load() and store its JSON for ttl seconds. Redis errors fall
+    through to load(), so the cache is never required.
+    """
+    r = get_redis()
+    if r is None:
+        return load()
+    # sha1 rather than hash(): the key has to match across processes
+    digest = hashlib.sha1(repr(key_parts).encode("utf-8")).hexdigest()
+    key = f"trenddit:{namespace}:{digest}"
+    try:
+        hit = r.get(key)
+        if hit is not None:
+            return _json_loads(hit)
+    except Exception:
+        pass
+    data = load()
+    try:
+        r.setex(key, ttl, _json_dumps(data))
+    except Exception:
+        pass
+    return data
+
+
+def clear_shared_cache(*namespaces):
+    """Drop every Redis entry under the given namespaces, e.g. after new rows land."""
+    r = get_redis()
+    if r is None:
+        return
+    try:
+        for ns in namespaces:
+            keys = list(r.scan_iter(f"trenddit:{ns}:*", count=500))
+            if keys:
+                r.delete(*keys)
+    except Exception:
+        pass
+
 
 # ===========================
 # AUTHENTICATION LOGIC
@@ -52,7 +159,9 @@ supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 def sign_up(email: str, password: str):
     """Sign up a new user with Supabase Auth"""
     try:
-        response = supabase.auth.sign_up({"email": email, "password": password})
+        response = get_auth_client().auth.sign_up(
+            {"email": email, "password": password}
+        )
         return response
     except Exception as e:
         return {"error": str(e)}
@@ -61,7 +170,7 @@ def sign_up(email: str, password: str):
 def sign_in(email: str, password: str):
     """Sign in an existing user"""
     try:
-        response = supabase.auth.sign_in_with_password(
+        response = get_auth_client().auth.sign_in_with_password(
             {"email": email, "password": password}
         )
         # Return the full response object
@@ -73,18 +182,40 @@ def sign_in(email: str, password: str):
 def sign_out():
     """Sign out current user"""
     try:
-        supabase.auth.sign_out()
+        get_auth_client().auth.sign_out()
         return True
     except Exception as e:
         st.error(f"Sign out error: {e}")
         return False
 
 
+# How long a signed-in session is trusted before asking Supabase again
+AUTH_RECHECK_SECONDS = 60
+
+
 def check_authentication():
-    """Check if user is authenticated using Supabase session"""
+    """Check if user is authenticated using Supabase session
+
+    The answer is kept in session_state and the Supabase session is only
+    re-read every AUTH_RECHECK_SECONDS instead of on every rerun; sign-in and
+    sign-out update that state directly, so they take effect immediately.
+    """
+    authed = bool(
+        st.session_state.get("authenticated") and st.session_state.get("user")
+    )
+    checked_at = st.session_state.get("auth_checked_at")
+    if checked_at is not None and time.monotonic() - checked_at < AUTH_RECHECK_SECONDS:
+        return authed
+    if not authed and "auth_client" not in st.session_state:
+        # No auth client yet means nobody has signed in during this session,
+        # so there is no session to look up
+        st.session_state.authenticated = False
+        st.session_state.user = None
+        return False
+    st.session_state.auth_checked_at = time.monotonic()
     try:
         # Get current session from Supabase
-        session = supabase.auth.get_session()
+        session = get_auth_client().auth.get_session()
 
         # Check if session exists and has a user
         if session and hasattr(session, "user") and session.user:
@@ -110,489 +241,617 @@ def check_authentication():
         return False
 
 
-# Initialize session state on first load
+# Initialize session state on first load; the auth gate below runs
+# check_authentication() once per rerun
 if "authenticated" not in st.session_state:
     st.session_state.authenticated = False
     st.session_state.user = None
 
-# Check authentication status on every page load
-check_authentication()
-
 
 # ===========================
-# TEXT SANITIZATION HELPERS
+# DATA ACCESS
 # ===========================
-def strip_html_tags(text: str) -> str:
-    """Remove HTML tags and collapse extra whitespace from a string.
-    Keeps plain text only so user content never injects markup into our templates.
+# Rows loaded for the charts; the live posts panel pages through them too
+POSTS_WINDOW = 500
+# Columns used by the charts and the live stream. The 384-dim embedding is
+# left out here and only fetched by the clusters section; sentiment_score is
+# cast server-side so it always arrives as a JSON number, and the subreddit is
+# pulled out of the metadata jsonb so the app never parses JSON itself.
+POST_COLUMNS = (
+    "id,title,body,source,author,url,score,created_at,"
+    "sentiment_score::float4,sentiment_label,subreddit:metadata->>subreddit"
+)
+# Columns the cluster cards show; they come from the rows already loaded, and
+# only id,embedding is fetched for them (see cluster_summary)
+CLUSTER_COLUMNS = ["id", "title", "body", "url", "subreddit"]
+# ids per in.(...) filter, keeping the request URL well under proxy limits
+EMBEDDING_BATCH = 100
+# all-MiniLM-L6-v2 output size, matching the vector(384) column
+EMBEDDING_DIM = 384
+
+
+@st.cache_resource
+def _missing_columns():
+    """Column name -> time.monotonic() when the database reported it missing."""
+    return {}
+
+
+def _is_missing_column_error(e, column):
+    # Postgres undefined_column (42703), passed through by PostgREST
+    code = str(getattr(e, "code", "") or "")
+    return (code == "42703" or "42703" in str(e)) and column in str(e)
+
+
+def _full_text_available():
+    # search_tsv comes from sql/004; until it has run, plain keywords use the
+    # ILIKE filter (re-checked after RPC_RETRY_SECONDS, like a missing RPC)
+    since = _missing_columns().get("search_tsv")
+    return since is None or time.monotonic() - since >= RPC_RETRY_SECONDS
+
+
+@st.cache_data(ttl=30, show_spinner=False, max_entries=64)
+def _fetch_posts_cached(keyword, sources, start_time, limit, cursor, columns):
+    # Simple RPC via PostgREST style; id breaks ties between equal timestamps
+    query = (
+        get_supabase_client()
+        .table("posts")
+        .select(columns)
+        .order("created_at", desc=True)
+        .order("id", desc=True)
+    )
+    # Ensure ISO string includes timezone (Z) for timestamptz column
+    query = query.filter("created_at", "gte", start_time.isoformat())
+
+    if cursor:
+        # Keyset pagination: only rows strictly after (created_at, id) of the
+        # last row already shown, so deep pages cost the same as the first one
+        cursor_ts, cursor_id = cursor
+        query = query.or_(
+            f'created_at.lt."{cursor_ts}",'
+            f'and(created_at.eq."{cursor_ts}",id.lt."{cursor_id}")'
+        )
+
+    kw = (keyword or "").strip()
+    if kw and not WILDCARD_RE.search(kw) and _full_text_available():
+        # Full-text match on the GIN-indexed search_tsv column
+        # (sql/004_posts_full_text_search.sql) instead of scanning every row.
+        # wfts is websearch_to_tsquery, as in the SQL RPCs; a plain filter
+        # (unlike .text_search) keeps the builder chainable
+        query = query.filter("search_tsv", "wfts(english)", kw)
+    elif kw:
+        # Wildcard patterns (and any keyword before sql/004 has run) need ILIKE:
+        # title/body contains keyword OR keyword column matches
+        # PostgREST OR syntax: or=(col.op.val,...) — supabase-py v2 exposes .or_
+        try:
+            query = query.or_(
+                f"title.ilike.%{kw}%,body.ilike.%{kw}%,keyword.ilike.%{kw}%"
+            )
+        except Exception:
+            # Fallback to equality on keyword if .or_ not available
+            query = query.filter("keyword", "eq", kw)
+
+    if sources:
+        # Use native in_ helper for reliability
+        try:
+            query = query.in_("source", list(sources))
+        except Exception:
+            query = query.filter("source", "in", list(sources))
+
+    # Pages come from the cursor above, never an OFFSET; other app processes
+    # may already have this page
+    return shared_cache(
+        "posts",
+        (keyword, sources, start_time.isoformat(), limit, cursor, columns),
+        30,
+        lambda: query.limit(limit).execute().data or [],
+    )
+
+
+def fetch_posts(
+    keyword,
+    sources,
+    start_time,
+    limit=1000,
+    cursor=None,
+    columns=POST_COLUMNS,
+):
+    # Errors are handled outside the cached call so failures are never cached
+    try:
+        return _fetch_posts_cached(
+            keyword,
+            tuple(sorted(sources or ())),
+            start_time,
+            limit,
+            tuple(cursor) if cursor else None,
+            columns,
+        )
+    except Exception as e:
+        if _is_missing_column_error(e, "search_tsv") and _full_text_available():
+            # deployed ahead of sql/004: remember it and redo this fetch with ILIKE
+            _missing_columns()["search_tsv"] = time.monotonic()
+            return fetch_posts(keyword, sources, start_time, limit, cursor, columns)
+        st.error(f"Error fetching posts: {e}")
+        return []
+
+
+# An RPC from sql/ that is not deployed is remembered for this long, so reruns
+# and fragment ticks go straight to their fallbacks instead of paying a failing
+# round trip each time; it is tried again afterwards in case it was added
+RPC_RETRY_SECONDS = 300
+
+
+@st.cache_resource
+def _missing_rpcs():
+    """RPC name -> time.monotonic() when the database reported it missing."""
+    return {}
+
+
+def _is_rpc_missing_error(e):
+    # PostgREST answers an unknown function with PGRST202 (HTTP 404)
+    code = str(getattr(e, "code", "") or "")
+    return code in ("PGRST202", "404") or "PGRST202" in str(e)
+
+
+def call_rpc(fn, params):
+    """
+    Execute a Postgres function through PostgREST and return its rows. Raises
+    LookupError without a request while fn is known to be missing; other
+    errors propagate and are retried on the next call.
+    """
+    missing = _missing_rpcs()
+    since = missing.get(fn)
+    if since is not None and time.monotonic() - since < RPC_RETRY_SECONDS:
+        raise LookupError(f"RPC {fn} is not deployed")
+    try:
+        res = get_supabase_client().rpc(fn, params).execute()
+    except Exception as e:
+        if _is_rpc_missing_error(e):
+            missing[fn] = time.monotonic()
+        raise
+    missing.pop(fn, None)
+    return res.data or []
+
+
+@st.cache_data(ttl=300, show_spinner=False, max_entries=16)
+def _fetch_embeddings_cached(post_ids):
+    client = get_supabase_client()
+    try:
+        # int8 copies quantized in Postgres: a fraction of the vector text
+        # (sql/008_post_embeddings_int8.sql)
+        rows = call_rpc("post_embeddings_int8", {"ids": list(post_ids)})
+        return [
+            {"id": r["id"], "embedding": dequantize_int8(r["q"], r["scale"])}
+            for r in rows
+        ]
+    except Exception:
+        pass
+    # RPC not deployed: read the float vectors themselves
+    rows = []
+    for i in range(0, len(post_ids), EMBEDDING_BATCH):
+        batch = list(post_ids[i : i + EMBEDDING_BATCH])
+        rows += (
+            client.table("posts").select("id,embedding").in_("id", batch).execute().data
+            or []
+        )
+    return rows
+
+
+@st.cache_data(ttl=15, show_spinner=False)
+def load_alerts(limit=10):
+    query = (
+        get_supabase_client()
+        .table("alerts")
+        .select("*")
+        .order("triggered_at", desc=True)
+        .limit(limit)
+    )
+    return shared_cache("alerts", (limit,), 15, lambda: query.execute().data or [])
+
+
+# Postgres interval for each timeline bucket size
+TIMELINE_INTERVALS = {"15min": "15 minutes", "1h": "1 hour"}
+
+
+def _rpc_cached(fn, keyword, sources, start_time, freq, **params):
+    """Call one of the dashboard's aggregate RPCs (same filters as fetch_posts)."""
+    params.update(
+        kw=(keyword or "").strip(),
+        src=list(sources),
+        start_ts=start_time.isoformat(),
+        bucket=TIMELINE_INTERVALS[freq],
+    )
+
+    if fn in _missing_rpcs():
+        # skip the shared cache lookup too; call_rpc decides whether to retry
+        return call_rpc(fn, params)
+    return shared_cache(fn, sorted(params.items()), 30, lambda: call_rpc(fn, params))
+
+
+@st.cache_data(ttl=30, show_spinner=False, max_entries=64)
+def _fetch_timeline_cached(keyword, sources, start_time, freq):
+    return _rpc_cached("sentiment_timeline", keyword, sources, start_time, freq)
+
+
+@st.cache_data(ttl=30, show_spinner=False, max_entries=64)
+def _fetch_kpis_cached(keyword, sources, start_time, freq):
+    return _rpc_cached("dashboard_kpis", keyword, sources, start_time, freq)
+
+
+@st.cache_data(ttl=30, show_spinner=False, max_entries=64)
+def _fetch_dashboard_cached(keyword, sources, start_time, freq):
+    return _rpc_cached(
+        "dashboard_bundle", keyword, sources, start_time, freq, post_limit=POSTS_WINDOW
+    )
+
+
+def fetch_dashboard(keyword, sources, start_time, freq):
+    """
+    Posts window, timeline rows, KPI row and alerts in one round trip
+    (see sql/007_dashboard_bundle.sql). Returns None when the RPC is unavailable
+    so callers fall back to the individual queries.
+    """
+    try:
+        bundle = _fetch_dashboard_cached(
+            keyword, tuple(sorted(sources or ())), start_time, freq
+        )
+    except Exception:
+        return None
+    return bundle or None
+
+
+def fetch_timeline(keyword, sources, start_time, freq):
+    """Sentiment timeline aggregated in Postgres (see sql/003_sentiment_timeline.sql).
+
+    Returns None when the RPC is unavailable so callers can aggregate locally.
+    """
+    try:
+        rows = _fetch_timeline_cached(
+            keyword, tuple(sorted(sources or ())), start_time, freq
+        )
+    except Exception:
+        return None
+    return timeline_to_df(rows, freq)
+
+
+def timeline_to_df(rows, freq):
+    """Frame of sentiment_timeline rows with the empty buckets filled in."""
+    timeline = pd.DataFrame(rows, columns=["created_at", "avg_sentiment", "volume"])
+    if timeline.empty:
+        return timeline
+    timeline["created_at"] = pd.to_datetime(
+        timeline["created_at"], utc=True, format="ISO8601"
+    )
+    # Postgres skips empty buckets; fill them in like a pandas resample would
+    timeline = timeline.set_index("created_at").asfreq(freq)
+    timeline["volume"] = timeline["volume"].fillna(0).astype(int)
+    timeline["avg_sentiment"] = timeline["avg_sentiment"].ffill()
+    return timeline.reset_index()
+
+
+# Fallback when the sentiment_timeline RPC is missing. Keyed on the post ids
+# like cached_top_ngrams: a post's time and score never change once stored.
+@st.cache_data(ttl=300, show_spinner=False, max_entries=32)
+def local_timeline(post_ids, freq, _df):
+    """Average sentiment and volume per bucket, computed from the loaded rows."""
+    # mean and volume in one grouped pass over a local series so the caller's
+    # frame keeps its columns and row order
+    scores = _df["sentiment_score"].fillna(0)
+    timeline = (
+        scores.set_axis(_df["created_at"])
+        .groupby(pd.Grouper(freq=freq))
+        .agg(avg_sentiment="mean", volume="size")
+        .reset_index()
+    )
+    timeline["avg_sentiment"] = timeline["avg_sentiment"].ffill()
+    return timeline
+
+
+def fetch_kpis(keyword, sources, start_time, freq):
+    """KPI card values computed in Postgres (see sql/005_dashboard_kpis.sql).
+
+    Returns None when the RPC is unavailable so callers can compute them locally.
     """
-    if not text:
-        return ""
-    # Remove tags
-    no_tags = re.sub(r"<[^>]+>", " ", str(text))
-    # Collapse whitespace
-    return re.sub(r"\s+", " ", no_tags).strip()
+    try:
+        rows = _fetch_kpis_cached(
+            keyword, tuple(sorted(sources or ())), start_time, freq
+        )
+    except Exception:
+        return None
+    return rows[0] if rows else None
+
+
+# ---- live posts pagination (keyset cursors) ----
+def _read_cursor_param():
+    """Restore the current page cursor from the URL, e.g. after a reload."""
+    raw = st.query_params.get("cursor")
+    if not raw or "|" not in raw:
+        return []
+    cursor_ts, cursor_id = raw.split("|", 1)
+    # both halves end up quoted inside the PostgREST or=(...) filter, so
+    # anything but a timestamp and a post id is ignored rather than sent
+    try:
+        datetime.fromisoformat(cursor_ts)
+    except ValueError:
+        return []
+    if not POST_ID_RE.fullmatch(cursor_id):
+        return []
+    return [(cursor_ts, cursor_id)]
+
+
+def _sync_cursor_param():
+    stack = st.session_state.cursor_stack
+    if stack:
+        st.query_params["cursor"] = "|".join(stack[-1])
+    elif "cursor" in st.query_params:
+        del st.query_params["cursor"]
+
+
+def _next_page(last_post):
+    st.session_state.cursor_stack.append((last_post["created_at"], last_post["id"]))
+    _sync_cursor_param()
+
+
+def _prev_page():
+    if st.session_state.cursor_stack:
+        st.session_state.cursor_stack.pop()
+    _sync_cursor_param()
+
+
+def _page_from_window(window, cursor, page_size):
+    """
+    Slice a keyset page out of rows already loaded in (created_at, id) desc order.
+    The slice comes back short when the page runs past the end of the window;
+    returns None when the cursor is not in the window at all.
+    """
+    start = 0
+    if cursor:
+        cursor = (str(cursor[0]), str(cursor[1]))
+        start = next(
+            (
+                i + 1
+                for i, p in enumerate(window)
+                if (str(p.get("created_at")), str(p.get("id"))) == cursor
+            ),
+            None,
+        )
+        if start is None:
+            return None
+    return window[start : start + page_size]
+
+
+# Keyed on the post ids (posts are never edited after collection), so reruns
+# over the same posts neither hash nor re-tokenize their text; _posts itself is
+# left out of the cache key
+@st.cache_data(ttl=300, show_spinner=False, max_entries=64)
+def cached_top_ngrams(post_ids, _posts):
+    # sklearn is imported on first use rather than at app start
+    from nlp.ngrams import top_ngrams
+
+    def compute():
+        # combine title+body safely, straight from the raw rows
+        texts = [f"{p.get('title') or ''} {p.get('body') or ''}" for p in _posts]
+        return [list(pair) for pair in top_ngrams(texts, k=25)]
+
+    # other processes' results for the same posts are reusable too
+    return shared_cache("ngrams", post_ids, 3600, compute)
+
+
+def parse_embeddings(values):
+    """
+    values: sequence of embeddings as returned by PostgREST (lists or "[...]" strings)
+    or dequantized arrays
+    returns float32 array of shape (n, d)
+    """
+    if all(isinstance(v, (list, np.ndarray)) for v in values):
+        return np.asarray(values, dtype=np.float32)
+    if all(isinstance(v, str) for v in values):
+        # pgvector columns come back as "[f1,f2,...]" text: parse the whole
+        # batch in one C-level pass instead of one array per row
+        flat = np.fromstring(
+            ",".join(v.strip("[]") for v in values), sep=",", dtype=np.float32
+        )
+        if flat.size == len(values) * EMBEDDING_DIM:
+            return flat.reshape(len(values), EMBEDDING_DIM)
+    # Mixed batch: write each row straight into one contiguous float32 buffer
+    # (the layout KMeans consumes); None or invalid rows stay zero
+    E = np.zeros((len(values), EMBEDDING_DIM), dtype=np.float32)
+    for i, v in enumerate(values):
+        if isinstance(v, str) and v.startswith("["):
+            v = np.fromstring(v.strip("[]"), sep=",", dtype=np.float32)
+        if isinstance(v, (list, np.ndarray)) and len(v) == EMBEDDING_DIM:
+            E[i] = v
+    return E
+
+
+def fit_kmeans(embeddings, n_clusters):
+    """Cluster labels for an embedding matrix."""
+    try:
+        import faiss
+    except ImportError:
+        faiss = None
+    if faiss is not None:
+        # spherical k-means on unit vectors: one BLAS-backed Lloyd run with
+        # batched assignment, much faster than sklearn on 384-dim rows
+        E = np.array(embeddings, dtype=np.float32)
+        faiss.normalize_L2(E)
+        kmeans = faiss.Kmeans(
+            E.shape[1], n_clusters, niter=20, nredo=1, spherical=True, seed=42
+        )
+        kmeans.train(E)
+        _, labels = kmeans.index.search(E, 1)
+        return labels.ravel()
+
+    # only sessions that open the clusters section pay for this import
+    from sklearn.cluster import MiniBatchKMeans
+
+    # Mini-batch updates keep each pass cheap on 384-dim rows; a few inits
+    # guard against a poor start at the same total cost as one full KMeans run
+    kmeans = MiniBatchKMeans(
+        n_clusters=n_clusters, random_state=42, n_init=3, batch_size=256
+    )
+    return kmeans.fit(embeddings).labels_
+
+
+# Keyed on the post ids like cached_top_ngrams; _posts is left out of the key.
+# Through shared_cache, a summary computed by one app process (embedding
+# download and k-means included) is reused by the others.
+@st.cache_data(ttl=300, show_spinner=False, max_entries=16)
+def cluster_summary(post_ids, _posts):
+    """
+    [cluster, size, representative text, url, subreddit] for each topic
+    cluster of the given posts; empty when none of them has an embedding
+    """
+
+    def compute():
+        embeddings = pd.DataFrame(_fetch_embeddings_cached(post_ids))
+        if embeddings.empty:
+            return []
+        # join onto the rows already on screen instead of re-running the search
+        cluster_df = pd.DataFrame(_posts, columns=CLUSTER_COLUMNS).merge(
+            embeddings, on="id"
+        )
+        # embeddings stored as lists/strings; convert to numpy
+        E = parse_embeddings(cluster_df["embedding"].tolist())
+        # Ensure at least 2 clusters if possible
+        n_clusters = min(6, max(2, E.shape[0] // 10))
+        cluster_df["cluster"] = fit_kmeans(E, n_clusters)
+
+        summary = []
+        # first post of each cluster represents it
+        for c, subset in cluster_df.groupby("cluster", sort=True):
+            rep = subset.iloc[0]
+            # Clean and truncate representative text to avoid raw HTML
+            rep_text = strip_html_tags(rep.get("title") or rep.get("body", ""))
+            summary.append(
+                [
+                    int(c),
+                    len(subset),
+                    rep_text[:200],
+                    rep.get("url"),
+                    rep.get("subreddit"),
+                ]
+            )
+        return summary
+
+    return shared_cache("clusters", post_ids, 3600, compute)
+
+
+def build_timeline_figure(timeline, keyword):
+    """
+    Plotly figure for the sentiment timeline. Deliberately not st.cache_data:
+    unpickling a cached Figure re-runs plotly's validation and costs more than
+    building it from the downsampled arrays.
+    """
+    # never ship more points than the chart has pixels to draw them
+    line = m4_downsample(timeline, "avg_sentiment", TIMELINE_MAX_BUCKETS)
+    bars = m4_downsample(timeline, "volume", TIMELINE_MAX_BUCKETS)
+    # build traces straight from numpy arrays; skips plotly.express'
+    # DataFrame processing and pandas index scanning
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(
+        go.Scattergl(
+            x=line["created_at"].values,
+            y=line["avg_sentiment"].values,
+            mode="lines",
+            name="sentiment",
+        )
+    )
+    fig.add_trace(
+        go.Bar(
+            x=bars["created_at"].values,
+            y=bars["volume"].values,
+            name="volume",
+            opacity=0.4,
+            yaxis="y2",
+        )
+    )
+    # add secondary axis
+    fig.update_layout(
+        title=f"Average sentiment for '{keyword}'",
+        yaxis=dict(title="Avg sentiment"),
+        yaxis2=dict(title="Volume", overlaying="y", side="right", showgrid=False),
+        # keep zoom/pan state when the data refreshes
+        uirevision="timeline",
+    )
+    return fig
+
+
+try:
+    import pyarrow  # noqa: F401
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+# Arrow-backed strings keep each text column as one offsets+bytes buffer rather
+# than a Python object per cell; without pyarrow the columns stay object dtype
+TEXT_DTYPE = "string[pyarrow]" if HAS_PYARROW else None
+TEXT_COLUMNS = (
+    "title",
+    "body",
+    "source",
+    "author",
+    "url",
+    "sentiment_label",
+    "subreddit",
+)
+
+
+# helper to convert to dataframe
+def posts_to_df(posts):
+    df = pd.DataFrame(posts)
+    if df.empty:
+        return df
+    if TEXT_DTYPE:
+        cols = [c for c in TEXT_COLUMNS if c in df.columns]
+        df[cols] = df[cols].astype(TEXT_DTYPE)
+    # PostgREST returns RFC 3339 strings; the explicit format keeps pandas on its
+    # C ISO 8601 parser instead of inferring the format per element
+    df["created_at"] = pd.to_datetime(
+        df["created_at"], utc=True, format="ISO8601", cache=True
+    )
+    # already numeric from PostgREST; float32 is plenty for [-1, 1] scores
+    df["sentiment_score"] = df["sentiment_score"].astype("float32")
+    return df
 
 
 # ---- UI ----
-# Modern CSS with design tokens, navbar, KPI cards, chips, skeleton loaders
+# Modern CSS with design tokens, navbar, KPI cards, chips, skeleton loaders.
+# The stylesheet lives in static/trenddit.css and is read from disk once per
+# process. It is still inlined rather than linked: Streamlit's static file
+# server sends .css as text/plain, which browsers refuse as a stylesheet.
+# Sent on every rerun: Streamlit drops elements a rerun does not write, so
+# skipping it after the first run would unstyle the page.
+APP_CSS_PATH = os.path.join(os.path.dirname(__file__), "static", "trenddit.css")
+NAVBAR_HTML = """
+<!-- This is your exact navbar HTML, unchanged -->
+<nav class="td-navbar">
+    <div class="td-brand-area">
+        <span class="td-logo">🔍</span>
+        <span class="td-brand">Trenddit</span>
+    </div>
+    <div class="td-nav-links">
+        <a href="#overview" class="td-nav-link"><span class="td-emoji">🏠</span><span>Overview</span></a>
+        <a href="#sentiment-timeline" class="td-nav-link"><span class="td-emoji">📈</span><span>Sentiment</span></a>
+        <a href="#top-ngrams" class="td-nav-link"><span class="td-emoji">🧩</span><span>Keywords</span></a>
+        <a href="#topic-clusters" class="td-nav-link"><span class="td-emoji">🗂️</span><span>Clusters</span></a>
+        <a href="#live-posts" class="td-nav-link"><span class="td-emoji">⚡</span><span>Live</span></a>
+        <a href="#alerts" class="td-nav-link"><span class="td-emoji">🚨</span><span>Alerts</span></a>
+    </div>
+</nav>
+"""
 st.markdown(
-    """
-    <style>
-        :root{
-            --td-accent: #7c3aed;
-            --td-accent-2: #6366f1;
-            --td-bg: #f8fafc;
-            --td-card: #ffffff;
-            --td-text: #0f172a;
-            --td-muted: #6b7280;
-            --td-border: #e2e8f0;
-            --td-ring: rgba(124,58,237,.25);
-            --td-nav-height: 64px;
-        }
-        @media (prefers-color-scheme: dark){
-            :root{
-                --td-bg: #0f172a;
-                --td-card: #1e293b;
-                --td-text: #f1f5f9;
-                --td-muted: #94a3b8;
-                --td-border: #334155;
-            }
-        }
-        
-        /* Smooth scrolling for all scrollable elements */
-        html, body, * {
-            scroll-behavior: smooth !important;
-        }
-        
-        /* Target Streamlit's main container */
-        section[data-testid="stAppViewContainer"],
-        section[data-testid="stAppViewContainer"] > div,
-        .main {
-            scroll-behavior: smooth !important;
-        }
-        
-        /* Offset for anchor links to account for fixed navbar */
-        [id], a[id], [id]::before {
-            scroll-margin-top: calc(var(--td-nav-height) + 30px);
-            scroll-snap-margin-top: calc(var(--td-nav-height) + 30px);
-        
-        }
-        
-        body { 
-            -webkit-font-smoothing: antialiased; 
-            -moz-osx-font-smoothing: grayscale;
-        }
-        
-        /* Modern fixed navbar with enhanced animations */
-        .td-navbar{
-            position: fixed !important;
-            top: 0 !important; 
-            left: 0 !important;
-            right: 0 !important;
-            width: 100% !important;
-            max-width: 100vw !important;
-            z-index: 9999 !important;
-            min-height: var(--td-nav-height);
-            display: flex !important; 
-            align-items: center; 
-            justify-content: space-between;
-            padding: 0 24px;
-            background: linear-gradient(135deg, var(--td-accent) 0%, var(--td-accent-2) 100%);
-            backdrop-filter: blur(16px) saturate(180%);
-            -webkit-backdrop-filter: blur(16px) saturate(180%);
-            border-bottom: 1px solid rgba(255,255,255,0.12);
-            box-shadow: 0 4px 20px rgba(0,0,0,0.12), 0 1px 4px rgba(0,0,0,0.08);
-            border-radius: 0 0 24px 24px;
-            box-sizing: border-box;
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            margin: 0 !important;
-            visibility: visible !important;
-            opacity: 1 !important;
-        }
-        /* Hardening: ensure navbar shows across desktop breakpoints with higher specificity */
-        @media (min-width: 769px){
-            body .td-navbar, .stApp .td-navbar, .stAppViewContainer .td-navbar{
-                display: flex !important;
-                visibility: visible !important;
-                opacity: 1 !important;
-            }
-        }
-        @media (min-width: 1024px){
-            body .td-navbar, .stApp .td-navbar, .stAppViewContainer .td-navbar{
-                display: flex !important;
-                visibility: visible !important;
-                opacity: 1 !important;
-            }
-        }
-        /* Ensure navbar is visible on desktop/large screens as well */
-        @media (min-width: 769px){
-            .td-navbar{
-                display: flex !important;
-                visibility: visible !important;
-                opacity: 1 !important;
-            }
-        }
-        
-        /* Navbar hover effect */
-        .td-navbar:hover {
-            box-shadow: 0 6px 28px rgba(0,0,0,0.15), 0 2px 8px rgba(0,0,0,0.1);
-        }
-        
-        /* Push content below fixed navbar */
-        .block-container {
-            padding-top: calc(var(--td-nav-height) + 24px) !important;
-        }
-
-        /* Brand area with logo animation */
-        .td-brand-area{
-            display: flex !important; 
-            align-items: center; 
-            gap: 12px;
-            transition: transform 0.3s ease;
-            visibility: visible !important;
-        }
-        .td-brand-area:hover {
-            transform: scale(1.05);
-        }
-        .td-logo{ 
-            font-size: 1.6rem;
-            filter: drop-shadow(0 2px 4px rgba(0,0,0,0.1));
-            display: inline-block !important;
-        }
-        .td-brand{
-            font-weight: 700; 
-            font-size: 1.15rem;
-            color: white; 
-            letter-spacing: -0.02em;
-            text-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            display: inline-block !important;
-        }
-        
-        /* Navigation links container */
-        .td-nav-links{
-            display: flex !important; 
-            gap: 8px; 
-            align-items: center; 
-            flex-wrap: wrap;
-            visibility: visible !important;
-        }
-        
-        /* Modern pill-style navigation links with smooth animations */
-        .td-nav-link{
-            display: inline-flex !important; 
-            align-items: center; 
-            gap: 8px;
-            padding: 11px 20px; 
-            border-radius: 50px;
-            color: rgba(255,255,255,0.95); 
-            text-decoration: none;
-            font-weight: 600; 
-            font-size: 0.94rem;
-            background: rgba(255,255,255,0.12);
-            border: 1px solid rgba(255,255,255,0.18);
-            backdrop-filter: blur(10px);
-            -webkit-backdrop-filter: blur(10px);
-            transition: all 0.35s cubic-bezier(0.4,0,0.2,1);
-            position: relative;
-            cursor: pointer;
-            overflow: hidden;
-            visibility: visible !important;
-        }
-        
-        /* Shimmer effect on hover */
-        .td-nav-link::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: -100%;
-            width: 100%;
-            height: 100%;
-            background: linear-gradient(90deg, transparent, rgba(255,255,255,0.2), transparent);
-            transition: left 0.5s ease;
-        }
-        
-        .td-nav-link:hover::before {
-            left: 100%;
-        }
-        
-        /* Hover state with enhanced lift effect */
-        .td-nav-link:hover{
-            color: white;
-            background: rgba(255,255,255,0.28);
-            border-color: rgba(255,255,255,0.4);
-            transform: translateY(-3px) scale(1.02);
-            box-shadow: 0 6px 20px rgba(0,0,0,0.2), 0 2px 8px rgba(0,0,0,0.15);
-        }
-        
-        /* Active/click state */
-        .td-nav-link:active{
-            transform: translateY(-1px) scale(0.98);
-            box-shadow: 0 3px 10px rgba(0,0,0,0.15);
-            transition: all 0.1s ease;
-        }
-        
-        /* Focus state for accessibility */
-        .td-nav-link:focus {
-            outline: 2px solid rgba(255,255,255,0.6);
-            outline-offset: 2px;
-        }
-        
-        .td-emoji{ 
-            font-size: 1.1rem;
-            transition: transform 0.3s ease;
-        }
-        
-        .td-nav-link:hover .td-emoji {
-            transform: scale(1.15) rotate(5deg);
-        }
-        
-        /* Responsive design - Mobile overrides */
-        @media (max-width: 768px){
-            .td-navbar { 
-                padding: 0 16px; 
-                border-radius: 0 0 18px 18px; 
-            }
-            .td-nav-links{ gap: 6px; }
-            .td-nav-link{ padding: 9px 14px; font-size: 0.9rem; }
-            .td-logo { font-size: 1.5rem; }
-        }
-        
-        /* Extra small screens */
-        @media (max-width: 540px){
-            .td-brand{ display: none !important; }
-            .td-nav-links{ gap: 5px; }
-            .td-nav-link{ padding: 8px 12px; font-size: 0.88rem; }
-            .td-navbar { padding: 0 12px; border-radius: 0 0 16px 16px; }
-            .td-logo { font-size: 1.4rem; }
-        }
-
-        /* --- ALL OTHER STYLES (KPI, Chips, etc.) --- */
-        /* --- (These are unchanged from your original code) --- */
-        
-        /* KPI Cards */
-        .td-kpi-row{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 16px;
-            margin: 20px 0;
-        }
-        .td-kpi-card{
-            background: var(--td-card);
-            border: 1px solid var(--td-border);
-            border-radius: 14px;
-            padding: 18px 20px;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.06);
-            transition: all 0.2s ease;
-        }
-        .td-kpi-card:hover{
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-        }
-        .td-kpi-label{
-            font-size: 0.8rem;
-            color: var(--td-muted);
-            font-weight: 600;
-            text-transform: uppercase;
-            letter-spacing: 0.05em;
-            margin-bottom: 8px;
-        }
-        .td-kpi-value{
-            font-size: 2rem;
-            font-weight: 700;
-            color: var(--td-text);
-            line-height: 1.2;
-        }
-        .td-kpi-icon{
-            font-size: 1.5rem;
-            opacity: 0.7;
-        }
-        .td-delta{
-            display: inline-flex;
-            align-items: center;
-            gap: 4px;
-            margin-top: 8px;
-            padding: 4px 8px;
-            border-radius: 8px;
-            font-size: 0.8rem;
-            font-weight: 600;
-        }
-        .td-delta.up{ background: #d1fae5; color: #065f46; }
-        .td-delta.down{ background: #fee2e2; color: #991b1b; }
-
-        /* Chips */
-        .td-chip{
-            display: inline-flex;
-            align-items: center;
-            gap: 6px;
-            padding: 6px 12px;
-            background: var(--td-card);
-            border: 1px solid var(--td-border);
-            border-radius: 20px;
-            font-size: 0.85rem;
-            font-weight: 600;
-            color: var(--td-text);
-            transition: all 0.2s ease;
-            margin: 4px;
-        }
-        .td-chip:hover{
-            transform: translateY(-1px);
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-        }
-        .td-chip-count{
-            background: var(--td-accent);
-            color: white;
-            padding: 2px 6px;
-            border-radius: 10px;
-            font-size: 0.75rem;
-        }
-
-        /* Post Cards */
-        .td-post-card{
-            background: var(--td-card);
-            border: 1px solid var(--td-border);
-            border-radius: 14px;
-            padding: 16px 20px;
-            margin-bottom: 14px;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.06);
-            transition: all 0.2s ease;
-        }
-        .td-post-card:hover{
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-        }
-        .td-post-header{
-            display: flex;
-            align-items: center;
-            gap: 10px;
-            flex-wrap: wrap;
-            margin-bottom: 12px;
-        }
-        .td-post-title{
-            font-size: 1.05rem;
-            font-weight: 700;
-            color: var(--td-text);
-            margin-bottom: 8px;
-        }
-        .td-post-meta{
-            font-size: 0.8rem;
-            color: var(--td-muted);
-        }
-        .td-sentiment-badge{
-            display: inline-flex;
-            align-items: center;
-            gap: 4px;
-            padding: 4px 10px;
-            border-radius: 12px;
-            font-size: 0.8rem;
-            font-weight: 600;
-        }
-        .td-sentiment-badge.positive{ background: #d1fae5; color: #065f46; }
-        .td-sentiment-badge.neutral{ background: #e5e7eb; color: #374151; }
-        .td-sentiment-badge.negative{ background: #fee2e2; color: #991b1b; }
-        .td-link-btn{
-            display: inline-flex;
-            align-items: center;
-            gap: 4px;
-            padding: 6px 12px;
-            background: rgba(124,58,237,0.1);
-            color: var(--td-accent);
-            border-radius: 10px;
-            text-decoration: none;
-            font-size: 0.85rem;
-            font-weight: 600;
-            transition: all 0.2s ease;
-        }
-        .td-link-btn:hover{
-            background: var(--td-accent);
-            color: white;
-        }
-
-        /* Cluster Cards */
-        .td-cluster-card{
-            background: var(--td-card);
-            border: 1px solid var(--td-border);
-            border-radius: 14px;
-            padding: 16px 20px;
-            margin-bottom: 14px;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.06);
-            transition: all 0.2s ease;
-        }
-        .td-cluster-card:hover{
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-        }
-        .td-cluster-label{
-            display: inline-block;
-            padding: 4px 10px;
-            background: linear-gradient(135deg, var(--td-accent) 0%, var(--td-accent-2) 100%);
-            color: white;
-            border-radius: 10px;
-            font-size: 0.8rem;
-            font-weight: 600;
-            margin-bottom: 10px;
-        }
-
-        /* Skeleton Loaders */
-        @keyframes shimmer{
-            0%{ background-position: -200% 0; }
-            100%{ background-position: 200% 0; }
-        }
-        .td-skel{
-            background: linear-gradient(90deg, #f0f0f0 25%, #e0e0e0 50%, #f0f0f0 75%);
-            background-size: 200% 100%;
-            animation: shimmer 1.5s infinite;
-            border-radius: 8px;
-        }
-        .td-skel-h{ height: 20px; width: 60%; margin-bottom: 10px; }
-        .td-skel-p{ height: 80px; width: 100%; }
-        .td-skel-chip{ height: 32px; width: 80px; display: inline-block; margin: 4px; }
-
-        /* Reduced Motion */
-        @media (prefers-reduced-motion: reduce){
-            *, *::before, *::after{
-                animation-duration: 0.01ms !important;
-                animation-iteration-count: 1 !important;
-                transition-duration: 0.01ms !important;
-            }
-        }
-
-        /* Focus Rings */
-        a:focus, button:focus{
-            outline: 2px solid var(--td-ring);
-            outline-offset: 2px;
-        }
-    </style>
-    
-    <!-- This is your exact navbar HTML, unchanged -->
-    <nav class="td-navbar">
-        <div class="td-brand-area">
-            <span class="td-logo">🔍</span>
-            <span class="td-brand">Trenddit</span>
-        </div>
-        <div class="td-nav-links">
-            <a href="#overview" class="td-nav-link"><span class="td-emoji">🏠</span><span>Overview</span></a>
-            <a href="#sentiment-timeline" class="td-nav-link"><span class="td-emoji">📈</span><span>Sentiment</span></a>
-            <a href="#top-ngrams" class="td-nav-link"><span class="td-emoji">🧩</span><span>Keywords</span></a>
-            <a href="#topic-clusters" class="td-nav-link"><span class="td-emoji">🗂️</span><span>Clusters</span></a>
-            <a href="#live-posts" class="td-nav-link"><span class="td-emoji">⚡</span><span>Live</span></a>
-            <a href="#alerts" class="td-nav-link"><span class="td-emoji">🚨</span><span>Alerts</span></a>
-        </div>
-    </nav>
-""",
+    f"<style>\n{load_css(APP_CSS_PATH)}</style>\n{NAVBAR_HTML}",
     unsafe_allow_html=True,
 )
 
 # ===========================
 # AUTHENTICATION UI
 # ===========================
-if not check_authentication():
-    st.markdown('<div style="margin-top: 100px;"></div>', unsafe_allow_html=True)
-
-    col1, col2, col3 = st.columns([1, 2, 1])
-    with col2:
-        st.markdown(
-            """
+# Static markup for the sign-in page, built once at module level
+AUTH_SPACER_HTML = '<div style="margin-top: 100px;"></div>'
+AUTH_HERO_HTML = """
         <div style="text-align: center; margin-bottom: 2rem;">
             <div style="font-size: 3rem; margin-bottom: 0.5rem;">🔍</div>
             <h1 style="background: linear-gradient(135deg, #7c3aed 0%, #6366f1 100%); 
@@ -606,9 +865,19 @@ if not check_authentication():
                 Real-time social media analytics powered by AI
             </p>
         </div>
-        """,
-            unsafe_allow_html=True,
-        )
+        """
+
+
+# Its own fragment, so the sign-in/sign-up toggle only reruns this panel and
+# not the stylesheet and navbar above it; a successful sign-in still calls
+# st.rerun(), which reruns the whole app
+@st.fragment
+def auth_panel():
+    st.markdown(AUTH_SPACER_HTML, unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        st.markdown(AUTH_HERO_HTML, unsafe_allow_html=True)
 
         # Initialize session state for auth mode
         if "auth_mode" not in st.session_state:
@@ -713,6 +982,9 @@ if not check_authentication():
                     else:
                         st.warning("Please fill in all fields")
 
+
+if not check_authentication():
+    auth_panel()
     st.stop()
 
 # ===========================
@@ -760,14 +1032,34 @@ poll_interval = st.slider(
     "Polling interval (seconds)", min_value=10, max_value=300, value=30
 )
 
-# If user hit Enter in the keyword box, run collector once before fetching
+# If user hit Enter in the keyword box, run collector once before fetching.
+# Re-submitting the same keyword within the debounce window reuses the rows the
+# last run already stored instead of hitting Reddit and the NLP models again.
+COLLECT_DEBOUNCE_SECONDS = 60
 if st.session_state.get("should_collect"):
-    if collect_reddit is not None:
+    collect_kw = st.session_state.get("keyword", "").strip()
+    last_collect = st.session_state.get("last_collect")
+    recently_collected = (
+        last_collect is not None
+        and last_collect[0] == collect_kw
+        and time.monotonic() - last_collect[1] < COLLECT_DEBOUNCE_SECONDS
+    )
+    collect_reddit = None if recently_collected else load_collector()
+    if recently_collected:
+        st.toast(f"Posts for '{collect_kw}' were collected under a minute ago.")
+    elif collect_reddit is not None:
         try:
-            with st.spinner(
-                f"Collecting posts for '{st.session_state.get('keyword','')}'..."
-            ):
-                collect_reddit(st.session_state.get("keyword", "").strip(), limit=100)
+            with st.spinner(f"Collecting posts for '{collect_kw}'..."):
+                collect_reddit(collect_kw, limit=100, supabase=get_supabase_client())
+            st.session_state["last_collect"] = (collect_kw, time.monotonic())
+            # New rows were just written; drop cached query results
+            _fetch_posts_cached.clear()
+            _fetch_timeline_cached.clear()
+            _fetch_kpis_cached.clear()
+            _fetch_dashboard_cached.clear()
+            clear_shared_cache(
+                "posts", "sentiment_timeline", "dashboard_kpis", "dashboard_bundle"
+            )
             st.toast("Collection complete.")
         except Exception as e:
             st.warning(f"Collector error: {e}")
@@ -775,15 +1067,14 @@ if st.session_state.get("should_collect"):
         st.info(
             "Collector module not available in this session; skipping auto-collect."
         )
-    # Reset flag and proceed to fetch
+    # Reset flag and proceed to fetch; the upsert has committed by the time
+    # the collector returns, so the queries below already see the new rows
     st.session_state["should_collect"] = False
-    # Give DB a brief moment to commit
-    time.sleep(0.5)
 
 # Save query
 if st.button("Save query"):
     try:
-        supabase.table("queries").insert(
+        get_supabase_client().table("queries").insert(
             {"keyword": keyword, "sources": source}
         ).execute()
         st.success("Saved query")
@@ -797,114 +1088,82 @@ from datetime import timezone as _tz
 now = datetime.now(_tz.utc)
 tf_map = {"1h": 1, "6h": 6, "24h": 24, "7d": 24 * 7, "30d": 24 * 30}
 hours = tf_map.get(timeframe, 24)
-start_time = now - timedelta(hours=hours)
-
-
-# ---- fetch posts from supabase ----
-def fetch_posts(keyword, sources, start_time, limit=1000, offset=0):
-    # Simple RPC via PostgREST style
-    query = supabase.table("posts").select("*").order("created_at", desc=True)
-    # Ensure ISO string includes timezone (Z) for timestamptz column
-    query = query.filter("created_at", "gte", start_time.isoformat())
-
-    if keyword:
-        kw = keyword.strip()
-        # Broaden search: title/body contains keyword OR keyword column matches (case-insensitive)
-        # PostgREST OR syntax: or=(col.op.val,...) — supabase-py v2 exposes .or_
-        try:
-            query = query.or_(
-                f"title.ilike.%{kw}%,body.ilike.%{kw}%,keyword.ilike.%{kw}%"
-            )
-        except Exception:
-            # Fallback to equality on keyword if .or_ not available
-            query = query.filter("keyword", "eq", kw)
-
-    if sources:
-        # Use native in_ helper for reliability
-        try:
-            query = query.in_("source", list(sources))
-        except Exception:
-            query = query.filter("source", "in", list(sources))
-
-    try:
-        # Pagination for stream
-        res = query.range(offset, offset + limit - 1).execute()
-        # In v2, if successful, res.data contains the list
-        return res.data or []
-    except Exception as e:
-        # Handle the exception
-        st.error(f"Error fetching posts: {e}")
-        return []
-
-
-# helper to convert to dataframe
-def posts_to_df(posts):
-    df = pd.DataFrame(posts)
-    if df.empty:
-        return df
-    df["created_at"] = pd.to_datetime(df["created_at"])
-    df["inserted_at"] = pd.to_datetime(df["inserted_at"])
-    return df
-
-
-# initial load
-posts = fetch_posts(keyword, source, start_time, limit=500)
+# Truncate to the minute so the start time (and therefore the query cache key)
+# stays stable across reruns within the same minute
+start_time = (now - timedelta(hours=hours)).replace(second=0, microsecond=0)
+# Timeline / volume bucket size depends on timeframe
+freq = "15min" if hours <= 24 else "1h"
+# Timeline charts are downsampled to ~4 points per bucket beyond this width
+TIMELINE_MAX_BUCKETS = 300
+
+
+# initial load: one round trip when the dashboard_bundle RPC is deployed,
+# otherwise each section runs its own query
+bundle = fetch_dashboard(keyword, source, start_time, freq)
+if bundle is not None:
+    posts = bundle["posts"]
+else:
+    posts = fetch_posts(keyword, source, start_time, limit=POSTS_WINDOW)
 df = posts_to_df(posts)
 
+# Average sentiment and volume per bucket, shared by the KPI volume change and
+# the timeline chart. Aggregated in Postgres when the RPC is deployed (it covers
+# every matching post rather than just the rows loaded here).
+timeline = None
+if not df.empty:
+    if bundle is not None:
+        timeline = timeline_to_df(bundle["timeline"], freq)
+    else:
+        timeline = fetch_timeline(keyword, source, start_time, freq)
+    if timeline is None or timeline.empty:
+        timeline = local_timeline(tuple(df["id"]), freq, df)
+
 # ---- KPI Cards Row ----
 if not df.empty:
-    total_posts = len(df)
-    avg_sentiment = (
-        df["sentiment_score"].mean() if "sentiment_score" in df.columns else 0.0
-    )
+    top_subreddit = "—"
+    last_vol = prev_vol = 0
+    # one aggregate row from Postgres when the RPC is deployed; it covers every
+    # matching post rather than just the rows loaded here
+    if bundle is not None:
+        kpis = bundle["kpis"]
+    else:
+        kpis = fetch_kpis(keyword, source, start_time, freq)
+    if kpis is not None:
+        total_posts = kpis["total_posts"]
+        avg_sentiment = kpis["avg_sentiment"] or 0.0
+        if kpis["top_subreddit"]:
+            top_subreddit = f"r/{kpis['top_subreddit']}"
+        last_vol = kpis["last_volume"]
+        prev_vol = kpis["prev_volume"]
+    else:
+        total_posts = len(df)
+        avg_sentiment = (
+            df["sentiment_score"].mean() if "sentiment_score" in df.columns else 0.0
+        )
 
-    # Volume change (optional)
-    volume_change_str = "—"
-    try:
-        # Compute a quick timeline to get volume change
-        df_temp = df.copy()
-        df_temp["sentiment_score"] = pd.to_numeric(
-            df_temp["sentiment_score"], errors="coerce"
-        ).fillna(0)
-        df_temp = df_temp.set_index("created_at").sort_index()
-        if hours <= 24:
-            vol_series = df_temp["sentiment_score"].resample("15min").count()
-        else:
-            vol_series = df_temp["sentiment_score"].resample("1H").count()
-        if len(vol_series) >= 2:
-            last_vol = vol_series.iloc[-1]
-            prev_vol = vol_series.iloc[-2]
-            if prev_vol > 0:
-                change_pct = ((last_vol - prev_vol) / prev_vol) * 100
-                volume_change_str = (
-                    f"+{change_pct:.1f}%" if change_pct >= 0 else f"{change_pct:.1f}%"
-                )
-    except:
-        pass
+        # volume change from the timeline computed above, not another resample
+        if len(timeline) >= 2:
+            last_vol = timeline["volume"].iloc[-1]
+            prev_vol = timeline["volume"].iloc[-2]
 
-    # Top subreddit
-    top_subreddit = "—"
-    try:
-        if "metadata" in df.columns:
-            import json
-
-            subreddits = []
-            for meta in df["metadata"].dropna():
-                if isinstance(meta, str):
-                    try:
-                        m = json.loads(meta)
-                        if "subreddit" in m:
-                            subreddits.append(m["subreddit"])
-                    except:
-                        pass
-                elif isinstance(meta, dict) and "subreddit" in meta:
-                    subreddits.append(meta["subreddit"])
-            if subreddits:
-                from collections import Counter
-
-                top_subreddit = f"r/{Counter(subreddits).most_common(1)[0][0]}"
-    except:
-        pass
+        # Top subreddit
+        try:
+            # extracted from metadata by Postgres (see POST_COLUMNS), so no JSON
+            # parsing happens here
+            if "subreddit" in df.columns:
+                counts = df["subreddit"].value_counts()
+                if not counts.empty:
+                    top_subreddit = f"r/{counts.index[0]}"
+        except:
+            pass
+
+    # Volume change between the last two buckets (optional)
+    volume_change_str = "—"
+    if prev_vol > 0:
+        change_pct = ((last_vol - prev_vol) / prev_vol) * 100
+        volume_change_str = (
+            f"+{change_pct:.1f}%" if change_pct >= 0 else f"{change_pct:.1f}%"
+        )
 
     st.markdown(
         f"""
@@ -943,10 +1202,13 @@ else:
         unsafe_allow_html=True,
     )
 
-# Show matched posts count
+# Show matched posts count (the same total as the KPI card; the page itself
+# only loads the latest POSTS_WINDOW of them)
 if not df.empty:
+    loaded = f" (latest {len(df):,} loaded)" if len(df) < total_posts else ""
     st.caption(
-        f"📊 {len(df):,} posts matched since {start_time.strftime('%Y-%m-%d %H:%M UTC')}"
+        f"📊 {total_posts:,} posts matched since "
+        f"{start_time.strftime('%Y-%m-%d %H:%M UTC')}{loaded}"
     )
 else:
     st.caption("📊 No posts matched. Try a different keyword or expand the timeframe.")
@@ -972,69 +1234,26 @@ with left:
             st.session_state["expand_clicked"] = False
             st.info("Tip: Change timeframe selector to '7d' above to see more results.")
     else:
-        df = df.sort_values("created_at")
-        # ensure numeric
-        df["sentiment_score"] = pd.to_numeric(
-            df["sentiment_score"], errors="coerce"
-        ).fillna(0)
-        df.set_index("created_at", inplace=True)
-        # resample depending on timeframe
-        if hours <= 24:
-            res = df["sentiment_score"].resample("15min").mean().ffill()
-            vol = df["sentiment_score"].resample("15min").count()
-        else:
-            res = df["sentiment_score"].resample("1h").mean().ffill()
-            vol = df["sentiment_score"].resample("1h").count()
-        timeline = pd.DataFrame({"avg_sentiment": res, "volume": vol}).reset_index()
-        fig = px.line(
-            timeline,
-            x="created_at",
-            y="avg_sentiment",
-            title=f"Average sentiment for '{keyword}'",
-        )
-        fig.add_bar(
-            x=timeline["created_at"],
-            y=timeline["volume"],
-            name="volume",
-            opacity=0.4,
-            yaxis="y2",
-        )
-        # add secondary axis
-        fig.update_layout(
-            yaxis=dict(title="Avg sentiment"),
-            yaxis2=dict(title="Volume", overlaying="y", side="right", showgrid=False),
+        st.plotly_chart(
+            build_timeline_figure(timeline, keyword), use_container_width=True
         )
-        st.plotly_chart(fig, use_container_width=True)
 
     # Top n-grams
     st.markdown('<a id="top-ngrams"></a>', unsafe_allow_html=True)
     st.subheader("Top keywords / n-grams")
     if not df.empty:
-        # combine title+body safely
-        if "title" in df.columns and "body" in df.columns:
-            df_text = df["title"].fillna("") + " " + df["body"].fillna("")
-        elif "title" in df.columns:
-            df_text = df["title"].fillna("")
-        elif "body" in df.columns:
-            df_text = df["body"].fillna("")
-        else:
-            df_text = pd.Series([""])
-
-        # extract top n-grams
-        vectorizer = CountVectorizer(
-            stop_words="english", ngram_range=(1, 2), max_features=30
-        )
-        X = vectorizer.fit_transform(df_text)
-        freqs = zip(vectorizer.get_feature_names_out(), X.sum(axis=0).A1)
-        freq_df = pd.DataFrame(
-            sorted(freqs, key=lambda x: x[1], reverse=True), columns=["term", "count"]
-        )
+        # extract top n-grams: already (term, count) pairs, most frequent first
+        top_terms = cached_top_ngrams(tuple(p.get("id") for p in posts), posts)
 
         # Render as chips
-        chips_html = '<div style="margin-top: 14px;">'
-        for _, row in freq_df.head(25).iterrows():
-            chips_html += f'<span class="td-chip">{row["term"]} <span class="td-chip-count">{int(row["count"])}</span></span>'
-        chips_html += "</div>"
+        chips_html = (
+            '<div style="margin-top: 14px;">'
+            + "".join(
+                f'<span class="td-chip">{term} <span class="td-chip-count">{count}</span></span>'
+                for term, count in top_terms
+            )
+            + "</div>"
+        )
         st.markdown(chips_html, unsafe_allow_html=True)
     else:
         st.markdown(
@@ -1045,114 +1264,97 @@ with left:
     # Topic clusters (basic)
     st.markdown('<a id="topic-clusters"></a>', unsafe_allow_html=True)
     st.subheader("Topic clusters (approximate)")
-    # we will show top cluster labels and representative post
-    if not df.empty and "embedding" in df.columns:
-        # embeddings stored as lists/dicts; convert to numpy
+    # we will show top cluster labels and representative post.
+    # Embeddings are the heaviest column, so they are only fetched on demand.
+    if not df.empty and st.checkbox(
+        "Compute topic clusters", value=False, key="section_clusters_open"
+    ):
         try:
-            import ast
-
-            emb_list = df["embedding"].apply(
-                lambda x: (
-                    np.array(x)
-                    if isinstance(x, list)
-                    else (
-                        np.array(ast.literal_eval(x))
-                        if isinstance(x, str) and x.startswith("[")
-                        else np.array([0] * 384)  # Fallback for None or invalid
-                    )
-                )
-            )
+            summary = cluster_summary(tuple(p.get("id") for p in posts), posts)
+        except Exception as e:
+            st.warning("Clustering failed: " + str(e))
+            summary = None
+        if summary == []:
+            st.write("No embeddings available for clustering.")
 
-            # simple KMeans
-            from sklearn.decomposition import PCA
-            from sklearn.cluster import KMeans
+        # Render as styled cards
+        for c, count, rep_text, url, sub in summary or []:
+            import html
 
-            E = np.vstack(emb_list.to_list())
-            n_clusters = min(
-                6, max(2, E.shape[0] // 10)
-            )  # Ensure at least 2 clusters if possible
+            # Escape HTML in representative text to prevent rendering HTML tags
+            rep_text_escaped = html.escape(rep_text)
 
-            if n_clusters < 2:
-                st.write("Not enough data to form clusters.")
-            else:
-                kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10).fit(
-                    E
-                )
-                df["cluster"] = kmeans.labels_
-                cluster_summary = []
-
-                # Make sure df index is reset for iloc to work as expected
-                df_reset = df.reset_index()
-
-                for c in sorted(df["cluster"].unique()):
-                    subset = df_reset[df_reset["cluster"] == c]
-                    if not subset.empty:
-                        rep = subset.iloc[0]  # Get first post in cluster
-                        # Clean and truncate representative text to avoid raw HTML
-                        rep_text_raw = rep.get("title") or rep.get("body", "")
-                        rep_text_clean = strip_html_tags(rep_text_raw)
-                        rep_text_trunc = (
-                            rep_text_clean[:200]
-                            if len(rep_text_clean) > 200
-                            else rep_text_clean
-                        )
-                        cluster_summary.append(
-                            (
-                                c,
-                                len(subset),
-                                rep_text_trunc,
-                                rep.get("url"),
-                            )
-                        )
-
-                # Render as styled cards
-                for c, count, rep_text, url in cluster_summary:
-                    import html
-
-                    # Escape HTML in representative text to prevent rendering HTML tags
-                    rep_text_escaped = html.escape(rep_text)
-
-                    subreddit_label = "—"
-                    try:
-                        meta = (
-                            df_reset[df_reset["cluster"] == c].iloc[0].get("metadata")
-                        )
-                        if isinstance(meta, str):
-                            import json
-
-                            meta = json.loads(meta)
-                        if isinstance(meta, dict) and "subreddit" in meta:
-                            subreddit_label = html.escape(f"r/{meta['subreddit']}")
-                    except:
-                        pass
-
-                    card_html = f"""
-                    <div class="td-cluster-card">
-                        <div class="td-cluster-label">Cluster {c}: {subreddit_label}</div>
-                        <div style="color: var(--td-text); margin-bottom: 10px;">{rep_text_escaped}</div>
-                        <div style="display: flex; justify-content: space-between; align-items: center;">
-                            <span style="color: var(--td-muted); font-size: 0.85rem;">{count} posts</span>
-                            <a href="{html.escape(url or '#', quote=True)}" target="_blank" class="td-link-btn">View Article ↗</a>
-                        </div>
-                    </div>
-                    """
-                    st.markdown(card_html, unsafe_allow_html=True)
+            subreddit_label = "—"
+            if isinstance(sub, str) and sub:
+                subreddit_label = html.escape(f"r/{sub}")
 
-        except Exception as e:
-            st.warning("Clustering failed: " + str(e))
-    else:
+            card_html = f"""
+            <div class="td-cluster-card">
+                <div class="td-cluster-label">Cluster {c}: {subreddit_label}</div>
+                <div style="color: var(--td-text); margin-bottom: 10px;">{rep_text_escaped}</div>
+                <div style="display: flex; justify-content: space-between; align-items: center;">
+                    <span style="color: var(--td-muted); font-size: 0.85rem;">{count} posts</span>
+                    <a href="{html.escape(url or '#', quote=True)}" target="_blank" class="td-link-btn">View Article ↗</a>
+                </div>
+            </div>
+            """
+            st.markdown(card_html, unsafe_allow_html=True)
+    elif df.empty:
         st.write("No embeddings available for clustering.")
 
-with right:
+# While auto-refresh is on, only the live posts and alerts panels re-run on each
+# poll tick; the charts, n-grams and clusters above are left alone
+auto_refresh = refresh_mode == "polling" and st.session_state.get("auto_refresh", False)
+
+
+@st.fragment(run_every=poll_interval if auto_refresh else None)
+def live_posts_panel():
     st.markdown('<a id="live-posts"></a>', unsafe_allow_html=True)
     st.subheader("Live posts")
     page_size = int(st.number_input("Page size", min_value=5, max_value=100, value=10))
-    # pagination controls
-    page = int(st.number_input("Page", min_value=1, value=1))
-    offset = (page - 1) * page_size
-    posts_page = fetch_posts(
-        keyword, source, start_time, limit=page_size, offset=offset
-    )
+    # pagination state: a stack of (created_at, id) cursors, one per page
+    # already passed; it resets whenever the query itself changes
+    stream_key = (keyword, tuple(sorted(source)), timeframe, page_size)
+    if "cursor_stack" not in st.session_state:
+        st.session_state.cursor_stack = _read_cursor_param()
+        st.session_state.cursor_query_key = stream_key
+    elif st.session_state.cursor_query_key != stream_key:
+        st.session_state.cursor_stack = []
+        st.session_state.cursor_query_key = stream_key
+        _sync_cursor_param()
+    cursor_stack = st.session_state.cursor_stack
+    cursor = cursor_stack[-1] if cursor_stack else None
+    # Serve the page from the initial load when it covers it: same cache key,
+    # so no extra round trip and the stream shows the rows the charts use.
+    # Looked up here rather than taken from `posts` so auto-refresh reruns of
+    # this fragment still pick up new rows once the cache expires.
+    window_bundle = fetch_dashboard(keyword, source, start_time, freq)
+    if window_bundle is not None:
+        window = window_bundle["posts"]
+    else:
+        window = fetch_posts(keyword, source, start_time, limit=POSTS_WINDOW)
+    posts_page = _page_from_window(window, cursor, page_size)
+    if posts_page is None:
+        posts_page = fetch_posts(
+            keyword,
+            source,
+            start_time,
+            limit=page_size,
+            cursor=cursor,
+            columns=POST_COLUMNS,
+        )
+    elif len(posts_page) < page_size and len(window) >= POSTS_WINDOW:
+        # the page runs past a full window (a short one already holds every
+        # matching row): fetch only the rows after its last one
+        last = window[-1]
+        posts_page = posts_page + fetch_posts(
+            keyword,
+            source,
+            start_time,
+            limit=page_size - len(posts_page),
+            cursor=(last["created_at"], last["id"]),
+            columns=POST_COLUMNS,
+        )
     if not posts_page:
         # Skeleton loaders
         st.markdown(
@@ -1164,88 +1366,109 @@ with right:
             unsafe_allow_html=True,
         )
     else:
-        for p in posts_page:
-            import html
+        import html
+
+        # Polling reruns mostly see the same page: rebuild the cards only when
+        # the rows or their "time ago" labels have changed. The labels tick per
+        # minute, but per second for posts under a minute old, so a page showing
+        # one of those is rebuilt on every tick until it is a minute old
+        created_labels = [pretty_time_ago(p.get("created_at")) for p in posts_page]
+        page_key = hashlib.blake2b(
+            json.dumps([posts_page, created_labels], default=str).encode(),
+            digest_size=16,
+        ).digest()
+        cached = st.session_state.get("live_posts_html")
+        if cached and cached[0] == page_key:
+            page_html = cached[1]
+        else:
+            # build every card first and send the page as one element instead of
+            # one markdown write per post
+            cards = []
+            for p, created in zip(posts_page, created_labels):
+                score = p.get("sentiment_score") or 0
+                label = p.get("sentiment_label") or "neutral"
+
+                # cleaned, truncated and escaped once per distinct title/body
+                title, body, body_suffix = post_card_text(
+                    p.get("title") or p.get("body") or "", p.get("body") or ""
+                )
 
-            created = pretty_time_ago(p.get("created_at"))
-            score = p.get("sentiment_score") or 0
-            label = p.get("sentiment_label") or "neutral"
-
-            # Clean, truncate, and escape title/body to prevent raw HTML rendering
-            title_raw = p.get("title") or p.get("body", "")
-            title_clean = strip_html_tags(title_raw)
-            title_trunc = title_clean[:80] if len(title_clean) > 80 else title_clean
-            title = html.escape(title_trunc)
-
-            body_raw = p.get("body") or ""
-            body_clean = strip_html_tags(body_raw)
-            # Truncate BEFORE escaping to avoid breaking HTML entities
-            body_truncated = body_clean[:150] if len(body_clean) > 150 else body_clean
-            body = html.escape(body_truncated)
-            body_suffix = "..." if len(body_raw) > 150 else ""
-
-            url = p.get("url") or "#"
-            source_name = p.get("source", "reddit")
-
-            # Escape author name as well
-            author = html.escape(p.get("author") or "Anonymous")
-
-            # Get subreddit from metadata
-            subreddit = "—"
-            try:
-                meta = p.get("metadata")
-                if isinstance(meta, str):
-                    import json
-
-                    meta = json.loads(meta)
-                if isinstance(meta, dict) and "subreddit" in meta:
-                    subreddit = html.escape(f"r/{meta['subreddit']}")
-            except:
-                pass
-
-            # Sentiment emoji and badge class
-            sentiment_emoji = "😐"
-            sentiment_class = "neutral"
-            if label == "positive" or score > 0.05:
-                sentiment_emoji = "😃"
-                sentiment_class = "positive"
-            elif label == "negative" or score < -0.05:
-                sentiment_emoji = "😞"
-                sentiment_class = "negative"
-
-            post_html = f"""
-            <div class="td-post-card">
-                <div class="td-post-header">
-                    <span class="td-chip">{subreddit}</span>
-                    <span class="td-sentiment-badge {sentiment_class}">{sentiment_emoji} {label.title()}</span>
-                </div>
-                <div class="td-post-title">{title}</div>
-                <div class="td-post-meta">
-                    {source_name} • {author} • {created} • ⬆ {p.get("score", 0)}
-                </div>
-                <div style="margin-top: 10px; color: var(--td-muted); font-size: 0.9rem;">
-                    {body}{body_suffix}
-                </div>
-                <div style="margin-top: 12px; text-align: right;">
-                    <a href="{html.escape(url, quote=True)}" target="_blank" class="td-link-btn">View on Reddit ↗</a>
+                url = p.get("url") or "#"
+                source_name = p.get("source", "reddit")
+
+                # Escape author name as well
+                author = html.escape(p.get("author") or "Anonymous")
+
+                # Subreddit comes pre-extracted from metadata (see POST_COLUMNS)
+                subreddit = "—"
+                if p.get("subreddit"):
+                    subreddit = html.escape(f"r/{p['subreddit']}")
+
+                # Sentiment emoji and badge class
+                sentiment_emoji = "😐"
+                sentiment_class = "neutral"
+                if label == "positive" or score > 0.05:
+                    sentiment_emoji = "😃"
+                    sentiment_class = "positive"
+                elif label == "negative" or score < -0.05:
+                    sentiment_emoji = "😞"
+                    sentiment_class = "negative"
+
+                post_html = f"""
+                <div class="td-post-card">
+                    <div class="td-post-header">
+                        <span class="td-chip">{subreddit}</span>
+                        <span class="td-sentiment-badge {sentiment_class}">{sentiment_emoji} {label.title()}</span>
+                    </div>
+                    <div class="td-post-title">{title}</div>
+                    <div class="td-post-meta">
+                        {source_name} • {author} • {created} • ⬆ {p.get("score", 0)}
+                    </div>
+                    <div style="margin-top: 10px; color: var(--td-muted); font-size: 0.9rem;">
+                        {body}{body_suffix}
+                    </div>
+                    <div style="margin-top: 12px; text-align: right;">
+                        <a href="{html.escape(url, quote=True)}" target="_blank" class="td-link-btn">View on Reddit ↗</a>
+                    </div>
                 </div>
-            </div>
-            """
-            st.markdown(post_html, unsafe_allow_html=True)
+                """
+                cards.append(post_html)
+            page_html = "".join(cards)
+            st.session_state.live_posts_html = (page_key, page_html)
+        st.markdown(page_html, unsafe_allow_html=True)
+
+    # pagination controls
+    prev_col, next_col = st.columns(2)
+    with prev_col:
+        st.button(
+            "← Newer",
+            on_click=_prev_page,
+            disabled=not cursor_stack,
+            use_container_width=True,
+        )
+    with next_col:
+        st.button(
+            "Older →",
+            on_click=_next_page,
+            args=(posts_page[-1] if posts_page else None,),
+            disabled=len(posts_page) < page_size,
+            use_container_width=True,
+        )
+
 
-    # Alerts panel
+@st.fragment(run_every=poll_interval if auto_refresh else None)
+def alerts_panel():
     st.markdown('<a id="alerts"></a>', unsafe_allow_html=True)
     st.subheader("Alerts")
     # **FIXED**: Use try/except for supabase-py v2 error handling
     try:
-        alerts_res = (
-            supabase.table("alerts")
-            .select("*")
-            .order("triggered_at", desc=True)
-            .limit(10)
-            .execute()
-        )
-        alerts = alerts_res.data or []
+        # looked up here rather than taken from `bundle` so poll reruns of
+        # this fragment see new alerts once the cache expires
+        alerts_bundle = fetch_dashboard(keyword, source, start_time, freq)
+        if alerts_bundle is not None:
+            alerts = alerts_bundle["alerts"]
+        else:
+            alerts = load_alerts()
         if not alerts:
             st.write("No alerts")
         else:
@@ -1257,18 +1480,40 @@ with right:
         st.error(f"Error loading alerts: {e}")
 
 
-# Export CSV
+with right:
+    live_posts_panel()
+    alerts_panel()
+
+
+# Export CSV (and Parquet when pyarrow is installed)
 if st.button("Export CSV"):
     if df.empty:
         st.warning("No data to export")
     else:
-        csv = df.reset_index().to_csv(index=False)
+        # leave out the embedding vectors, by far the largest column
+        export_df = df.drop(columns=["embedding"], errors="ignore")
+        # write straight into a bytes buffer (no intermediate str copy)
+        buf = BytesIO()
+        export_df.to_csv(buf, index=False)
+        buf.seek(0)
         st.download_button(
             "Download posts CSV",
-            data=csv,
+            data=buf,
             file_name=f"trenddit_{keyword}_{now.date()}.csv",
             mime="text/csv",
         )
+        if HAS_PYARROW:
+            # columnar and compressed: several times smaller than the CSV and
+            # keeps the column types (timestamps, float32 scores)
+            parquet_buf = BytesIO()
+            export_df.to_parquet(parquet_buf, index=False, compression="snappy")
+            parquet_buf.seek(0)
+            st.download_button(
+                "Download posts Parquet",
+                data=parquet_buf,
+                file_name=f"trenddit_{keyword}_{now.date()}.parquet",
+                mime="application/vnd.apache.parquet",
+            )
 
 # Polling loop (optional)
 if refresh_mode == "polling":
@@ -1278,12 +1523,9 @@ if refresh_mode == "polling":
     if st.button("⟳ Refresh"):
         st.rerun()
 
-    # simple auto-refresh
-    if st.checkbox("Auto-refresh", value=False):
-        # streamlit can't truly run background loops; we leverage rerun every poll_interval seconds
-        time.sleep(poll_interval)
-        # **FIXED**: Use st.rerun() instead of st.experimental_rerun()
-        st.rerun()
+    # simple auto-refresh: re-runs the live posts fragment every poll_interval
+    # seconds without blocking the script thread
+    st.checkbox("Auto-refresh", value=False, key="auto_refresh")
 
 # Note: For true realtime you can add supabase client-side realtime subscription using JS in React,
 # or run a background thread on server to push updates to DB and use client polling or SSE.
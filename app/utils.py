@@ -1,6 +1,35 @@
 # app/utils.py
+import html
 from datetime import datetime, timezone
+from functools import lru_cache
 from dateutil import parser, relativedelta
+import numpy as np
+from patterns import TAGS_WS_RE
+
+try:
+    # optional C HTML parser (see requirements.txt); falls back to a regex
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+
+
+# The same timestamps come back on every rerun; only the parse is cached, the
+# "ago" text depends on the current time and is recomputed each call
+@lru_cache(maxsize=4096)
+def _isoparse(ts):
+    # datetime.fromisoformat is C code and reads PostgREST's RFC 3339 output
+    # on Python 3.11+; dateutil covers older Pythons and looser formats
+    try:
+        return datetime.fromisoformat(ts)
+    except ValueError:
+        return parser.isoparse(ts)
+
+
+@lru_cache(maxsize=None)
+def load_css(path):
+    """Contents of a stylesheet, read from disk once per process."""
+    with open(path, encoding="utf-8") as f:
+        return f.read()
 
 
 def pretty_time_ago(ts):
@@ -8,7 +37,7 @@ def pretty_time_ago(ts):
         return ""
     if isinstance(ts, str):
         try:
-            dt = parser.isoparse(ts)
+            dt = _isoparse(ts)
         except:
             return ts
     else:
@@ -23,3 +52,67 @@ def pretty_time_ago(ts):
     if seconds < 86400:
         return f"{int(seconds//3600)}h ago"
     return dt.strftime("%Y-%m-%d %H:%M UTC")
+
+
+def m4_downsample(df, y, n_buckets):
+    """
+    Reduce an x-sorted frame to at most 4 rows per bucket: the first, last,
+    min and max of column y. The line drawn from these rows looks the same as
+    the full series at n_buckets pixels wide (M4 aggregation).
+    """
+    if len(df) <= 4 * n_buckets:
+        return df
+    d = df.reset_index(drop=True)
+    bucket = np.arange(len(d)) * n_buckets // len(d)
+    # fill only for picking min/max; the returned rows keep their original values
+    g = d[y].fillna(0).groupby(bucket)
+    starts = np.flatnonzero(np.diff(bucket, prepend=-1))
+    ends = np.append(starts[1:] - 1, len(d) - 1)
+    keep = np.unique(np.concatenate([starts, ends, g.idxmin(), g.idxmax()]))
+    return d.loc[keep]
+
+
+# Titles and bodies repeat across reruns and reposts; the cache lives here
+# rather than in the app script because the script is re-executed every rerun
+@lru_cache(maxsize=4096)
+def strip_html_tags(text: str) -> str:
+    """Remove HTML tags and collapse extra whitespace from a string.
+    Keeps plain text only so user content never injects markup into our templates.
+    """
+    if not text:
+        return ""
+    if not isinstance(text, str):
+        text = str(text)
+    if "<" not in text:
+        # most posts carry no markup at all; split() collapses and trims
+        # whitespace in one C-level pass
+        return " ".join(text.split())
+    if HTMLParser is not None:
+        # parses real markup properly and decodes entities in the same C pass
+        return " ".join(HTMLParser(text).text(separator=" ").split())
+    return TAGS_WS_RE.sub(" ", text).strip()
+
+
+@lru_cache(maxsize=4096)
+def post_card_text(title_raw, body_raw):
+    """
+    Cleaned, truncated and escaped (title, body, body_suffix) for a post card.
+    Cached because the same posts are re-rendered on every rerun and poll.
+    """
+    # Clean, truncate, and escape title/body to prevent raw HTML rendering
+    title_clean = strip_html_tags(title_raw)
+    title = html.escape(title_clean[:80])
+    body_clean = strip_html_tags(body_raw)
+    # Truncate BEFORE escaping to avoid breaking HTML entities
+    body = html.escape(body_clean[:150])
+    body_suffix = "..." if len(body_raw) > 150 else ""
+    return title, body, body_suffix
+
+
+def dequantize_int8(q_hex, scale):
+    """
+    float32 vector from an int8 embedding as PostgREST returns it (bytea as
+    "\\x..." hex) and its per-vector scale (see sql/008_post_embeddings_int8.sql)
+    """
+    q = np.frombuffer(bytes.fromhex(q_hex[2:]), dtype=np.int8)
+    return q.astype(np.float32) * np.float32(scale)
@@ -8,12 +8,15 @@ Usage:
 
 import os
 import argparse
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+import numpy as np
 import praw
 from supabase import create_client
-from nlp.sentiment import analyze_sentiment
-from nlp.embeddings import embed_text
+from nlp.sentiment import analyze_sentiments
+from nlp.embeddings import embed_texts
 import json
 from dotenv import load_dotenv
 
@@ -24,44 +27,93 @@ REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
 REDDIT_CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
 REDDIT_USER_AGENT = os.getenv("REDDIT_USER_AGENT", "trenddit/0.1 by demo")
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Create client once (lazily, so importing this module has no side effects)
+_supabase = None
 
 
-def fetch_and_store(keyword, limit=100):
+def _get_supabase():
+    global _supabase
+    if _supabase is None:
+        _supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+    return _supabase
+
+
+# Posts per embedding batch handed to the worker thread during the search
+EMBED_CHUNK = 32
+
+# One PRAW client per process, so its HTTP session and OAuth token are reused
+# across collections. PRAW is not thread-safe and the app may collect from
+# several sessions at once, so searches through it are serialized.
+_reddit = None
+_reddit_lock = threading.Lock()
+
+
+def _get_reddit():
+    global _reddit
+    if _reddit is None:
+        _reddit = praw.Reddit(
+            client_id=REDDIT_CLIENT_ID,
+            client_secret=REDDIT_CLIENT_SECRET,
+            user_agent=REDDIT_USER_AGENT,
+        )
+    return _reddit
+
+
+def fetch_and_store(keyword, limit=100, supabase=None):
+    """
+    supabase: optional client to reuse (e.g. the app's cached client);
+    defaults to this module's own client
+    """
+    if supabase is None:
+        supabase = _get_supabase()
     if not (REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET):
         raise RuntimeError("Missing REDDIT_CLIENT_ID/SECRET env vars")
-    reddit = praw.Reddit(
-        client_id=REDDIT_CLIENT_ID,
-        client_secret=REDDIT_CLIENT_SECRET,
-        user_agent=REDDIT_USER_AGENT,
-    )
 
     # Search across r/all
     query = keyword
     posts_fetched = []
+    texts = []
+    embedding_jobs = []
     print(f"Fetching {limit} posts from Reddit for '{keyword}'...")
-    for submission in reddit.subreddit("all").search(query, limit=limit, sort="new"):
-        data = {
-            "id": f"reddit:{submission.id}",
-            "source": "reddit",
-            "source_id": submission.id,
-            "keyword": keyword,
-            "title": submission.title,
-            "body": submission.selftext,
-            "author": str(submission.author) if submission.author else None,
-            "url": submission.url,
-            "score": submission.score,
-            "created_at": datetime.fromtimestamp(
-                submission.created_utc, tz=timezone.utc
-            ).isoformat(),
-            "metadata": json.dumps(
-                {
-                    "subreddit": submission.subreddit.display_name,
-                    "num_comments": submission.num_comments,
+    # Embed each full chunk on a worker thread while the search keeps paging
+    # through Reddit; the model releases the GIL, so network wait and encoding
+    # overlap instead of running back to back
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        with _reddit_lock:
+            reddit = _get_reddit()
+            for submission in reddit.subreddit("all").search(
+                query, limit=limit, sort="new"
+            ):
+                data = {
+                    "id": f"reddit:{submission.id}",
+                    "source": "reddit",
+                    "source_id": submission.id,
+                    "keyword": keyword,
+                    "title": submission.title,
+                    "body": submission.selftext,
+                    "author": str(submission.author) if submission.author else None,
+                    "url": submission.url,
+                    "score": submission.score,
+                    "created_at": datetime.fromtimestamp(
+                        submission.created_utc, tz=timezone.utc
+                    ).isoformat(),
+                    "metadata": json.dumps(
+                        {
+                            "subreddit": submission.subreddit.display_name,
+                            "num_comments": submission.num_comments,
+                        }
+                    ),
                 }
-            ),
-        }
-        posts_fetched.append(data)
+                posts_fetched.append(data)
+                texts.append((data["title"] or "") + "\n" + (data["body"] or ""))
+                if len(texts) % EMBED_CHUNK == 0:
+                    embedding_jobs.append(
+                        pool.submit(embed_texts, texts[-EMBED_CHUNK:])
+                    )
+        if len(texts) % EMBED_CHUNK:
+            embedding_jobs.append(
+                pool.submit(embed_texts, texts[-(len(texts) % EMBED_CHUNK) :])
+            )
 
     if not posts_fetched:
         print("No new posts found on Reddit.")
@@ -70,11 +122,9 @@ def fetch_and_store(keyword, limit=100):
     print(f"Found {len(posts_fetched)} posts. Processing NLP...")
 
     # 1. Pre-process ALL posts first (NLP, embeddings)
-    for p in posts_fetched:
-        text = (p.get("title") or "") + "\n" + (p.get("body") or "")
-        score, label = analyze_sentiment(text)
-        embedding = embed_text(text)  # returns list or numpy array
-
+    embeddings = np.concatenate([job.result() for job in embedding_jobs])
+    scores, labels = analyze_sentiments(texts)
+    for p, score, label, embedding in zip(posts_fetched, scores, labels, embeddings):
         p["sentiment_score"] = float(score)
         p["sentiment_label"] = label
 
@@ -85,9 +135,7 @@ def fetch_and_store(keyword, limit=100):
             p["metadata"] = {}
 
         # embedding column
-        p["embedding"] = (
-            embedding.tolist() if hasattr(embedding, "tolist") else embedding
-        )
+        p["embedding"] = embedding.tolist()
 
     # --- Efficient Batch Processing ---
 
@@ -112,7 +160,11 @@ def fetch_and_store(keyword, limit=100):
         # 5. Insert all new posts in ONE database call
         if posts_to_insert:
             print(f"Inserting {len(posts_to_insert)} new posts...")
-            supabase.table("posts").insert(posts_to_insert).execute()
+            # ignore_duplicates: rows another run stored after the check above
+            # are skipped instead of failing the whole batch on the primary key
+            supabase.table("posts").upsert(
+                posts_to_insert, on_conflict="id", ignore_duplicates=True
+            ).execute()
             print("Batch insert complete.")
 
             # 6. OPTIONAL: also populate separate embeddings table if present
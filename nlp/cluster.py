@@ -1,16 +1,21 @@
 # nlp/cluster.py
 """
-Small clustering utility using k-means. Given embeddings array (n x d),
-returns cluster labels and optionally cluster centers.
+Small clustering utility using mini-batch k-means. Given embeddings array
+(n x d), returns cluster labels and optionally cluster centers.
 """
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.random_projection import GaussianRandomProjection
 
+# MiniLM output size; anything wider is projected down to this many dims
+MAX_DIMS = 384
 
-def cluster_embeddings(embeddings, n_clusters=5):
+
+def cluster_embeddings(embeddings, n_clusters=5, model=None):
     """
     embeddings: numpy array shape (n, d)
+    model: optional MiniBatchKMeans from an earlier call; it is updated with
+    these embeddings (partial_fit) instead of being refit from scratch
     returns labels (n,) and centers (n_clusters, d)
     """
     if embeddings.shape[0] < n_clusters:
@@ -20,11 +25,18 @@ def cluster_embeddings(embeddings, n_clusters=5):
         centers = np.zeros((1, embeddings.shape[1]))
         return labels, centers
 
-    # optional PCA to speed up
-    if embeddings.shape[1] > 50:
-        pca = PCA(n_components=50)
-        reduced = pca.fit_transform(embeddings)
+    # mini-batch k-means handles 384 dims directly; wider inputs get a random
+    # projection (one matrix product, fixed seed so repeated calls agree)
+    # rather than a PCA fit
+    if embeddings.shape[1] > MAX_DIMS:
+        rp = GaussianRandomProjection(n_components=MAX_DIMS, random_state=42)
+        reduced = rp.fit_transform(embeddings)
     else:
         reduced = embeddings
-    km = KMeans(n_clusters=n_clusters, random_state=42).fit(reduced)
+    if model is not None:
+        model.partial_fit(reduced)
+        return model.predict(reduced), model.cluster_centers_
+    km = MiniBatchKMeans(
+        n_clusters=n_clusters, random_state=42, n_init=3, batch_size=256
+    ).fit(reduced)
     return km.labels_, km.cluster_centers_
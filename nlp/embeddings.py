@@ -3,18 +3,47 @@
 Embeddings using sentence-transformers (all-MiniLM-L6-v2 recommended).
 Returns numpy array (dtype float32) of dimension 384.
 """
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+
 from sentence_transformers import SentenceTransformer
 import numpy as np
 
 # Load model once
 _model = None
+# all-MiniLM-L6-v2 output size
+EMBEDDING_DIM = 384
+
+# EMBEDDINGS_BACKEND=onnx runs the model on ONNX Runtime instead of PyTorch,
+# using the int8-quantized export shipped in the model repo; needs
+# sentence-transformers>=3.2 with its onnx extra. Several times faster on CPU,
+# with vectors that match the PyTorch ones to within quantization noise.
+EMBEDDINGS_BACKEND = os.getenv("EMBEDDINGS_BACKEND", "torch")
+ONNX_MODEL_FILE = os.getenv("EMBEDDINGS_ONNX_FILE", "onnx/model_quint8_avx2.onnx")
+
+# Vectors of recently encoded texts, keyed by a digest of the text (LRU order)
+CACHE_SIZE = 10_000
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
 
 
 def _get_model():
     global _model
     if _model is None:
         # all-MiniLM-L6-v2 is small and fast (384 dims)
-        _model = SentenceTransformer("all-MiniLM-L6-v2")
+        if EMBEDDINGS_BACKEND == "onnx":
+            try:
+                _model = SentenceTransformer(
+                    "all-MiniLM-L6-v2",
+                    backend="onnx",
+                    model_kwargs={"file_name": ONNX_MODEL_FILE},
+                )
+            except Exception as e:
+                print(f"Note: ONNX embeddings unavailable, using PyTorch: {e}")
+        if _model is None:
+            _model = SentenceTransformer("all-MiniLM-L6-v2")
     return _model
 
 
@@ -22,10 +51,46 @@ def embed_text(texts):
     """
     Accepts a string or list of strings. Returns numpy array or list of arrays.
     """
-    model = _get_model()
-    if isinstance(texts, str):
-        emb = model.encode(texts, show_progress_bar=False)
-        return np.array(emb, dtype=float)
-    else:
-        embs = model.encode(texts, show_progress_bar=False)
-        return np.array(embs, dtype=float)
+    # float32 is the model's native output; dtype=float would upcast to float64
+    # and double the memory of every vector for no extra precision
+    embs = _get_model().encode(texts, show_progress_bar=False, convert_to_numpy=True)
+    return embs.astype(np.float32, copy=False)
+
+
+def embed_texts(texts, batch_size=64):
+    """
+    Encode a list of strings in batches of batch_size.
+    Returns an (n, 384) float32 numpy array, one row per text.
+
+    Identical texts (crossposts, mirrored titles) are encoded once, and vectors
+    of recently seen texts are reused from an in-process cache.
+    """
+    texts = list(texts)
+    if not texts:
+        # no need to load the model just to learn its width
+        return np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+    keys = [hashlib.blake2b(t.encode("utf-8"), digest_size=16).digest() for t in texts]
+    found = {}
+    todo = {}
+    with _cache_lock:
+        for k, t in zip(keys, texts):
+            if k in _cache:
+                _cache.move_to_end(k)
+                found[k] = _cache[k]
+            else:
+                todo.setdefault(k, t)
+    if todo:
+        embs = _get_model().encode(
+            list(todo.values()),
+            batch_size=batch_size,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+        )
+        with _cache_lock:
+            for k, emb in zip(todo, embs):
+                # a row of embs is a view that would keep the whole batch
+                # matrix alive for as long as it sits in the cache
+                found[k] = _cache[k] = emb.copy()
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+    return np.stack([found[k] for k in keys]).astype(np.float32, copy=False)
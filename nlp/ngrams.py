@@ -0,0 +1,72 @@
+# nlp/ngrams.py
+"""
+Top keyword / n-gram counts for a batch of documents.
+
+Counting goes through a stateless HashingVectorizer, so no vocabulary dict is
+built over the whole corpus; only the winning hash buckets are mapped back to
+human-readable terms.
+"""
+from functools import lru_cache
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.utils import murmurhash3_32
+
+N_FEATURES = 1 << 18
+
+
+def _bucket(term, n_features=N_FEATURES):
+    # Same column HashingVectorizer assigns to a term (see sklearn _hashing_fast)
+    h = murmurhash3_32(term, seed=0, positive=False)
+    if h == -(2**31):
+        return (2**31 - 1 - (n_features - 1)) % n_features
+    return abs(h) % n_features
+
+
+@lru_cache(maxsize=None)
+def _vectorizer(ngram_range):
+    # Built once per ngram_range and reused: HashingVectorizer is stateless, so
+    # the stop-word set and token regex never need rebuilding between calls
+    hv = HashingVectorizer(
+        n_features=N_FEATURES,
+        ngram_range=ngram_range,
+        stop_words="english",
+        alternate_sign=False,
+        norm=None,
+        # raw counts: integers, at half the size of the default float64
+        dtype=np.int32,
+    )
+    return hv, hv.build_analyzer()
+
+
+def top_ngrams(texts, k=25, ngram_range=(1, 2)):
+    """
+    texts: sequence of strings
+    returns list of (term, count) for the k most frequent n-grams, most frequent first
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    hv, analyzer = _vectorizer(tuple(ngram_range))
+    X = hv.transform(texts)
+    counts = np.asarray(X.sum(axis=0)).ravel()
+    k = min(k, np.count_nonzero(counts))
+    if k == 0:
+        return []
+
+    # top-k buckets without sorting the whole feature space
+    top = np.argpartition(counts, -k)[-k:]
+    top = top[np.argsort(counts[top])[::-1]]
+
+    # name each bucket from the first document that contains it
+    X = X.tocsc()
+    doc_terms = {}
+    result = []
+    for b in top:
+        doc = X.indices[X.indptr[b]]
+        if doc not in doc_terms:
+            doc_terms[doc] = analyzer(texts[doc])
+        term = next((t for t in doc_terms[doc] if _bucket(t) == b), None)
+        if term is not None:
+            result.append((term, int(counts[b])))
+    return result
@@ -8,10 +8,38 @@ label: 'positive'|'neutral'|'negative'
 """
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 import nltk
+import numpy as np
+import string
 
 # Ensure VADER lexicon is present
 nltk.download("vader_lexicon", quiet=True)
 _sid = SentimentIntensityAnalyzer()
+_LEXICON = _sid.lexicon
+_PUNCTUATION = string.punctuation
+
+
+def _scorable(text):
+    """
+    False when no word of text is in the VADER lexicon, so its compound is
+    exactly 0 and polarity_scores can be skipped. VADER looks words up
+    lowercased, either as-is or with surrounding punctuation stripped; both
+    forms are checked, so this never skips a text VADER would score.
+    """
+    if not text:
+        return False
+    for w in text.lower().split():
+        if w in _LEXICON or w.strip(_PUNCTUATION) in _LEXICON:
+            return True
+    return False
+
+
+def _label(compound):
+    # thresholding: common VADER thresholds
+    if compound >= 0.05:
+        return "positive"
+    if compound <= -0.05:
+        return "negative"
+    return "neutral"
 
 
 def analyze_sentiment(text: str):
@@ -19,11 +47,16 @@ def analyze_sentiment(text: str):
         return 0.0, "neutral"
     s = _sid.polarity_scores(text)
     compound = float(s.get("compound", 0.0))
-    # thresholding: common VADER thresholds
-    if compound >= 0.05:
-        label = "positive"
-    elif compound <= -0.05:
-        label = "negative"
-    else:
-        label = "neutral"
-    return compound, label
+    return compound, _label(compound)
+
+
+def analyze_sentiments(texts):
+    """
+    Batch version of analyze_sentiment.
+    Returns (scores, labels): a float32 array of compound scores and a list of labels.
+    """
+    polarity_scores = _sid.polarity_scores
+    compounds = [polarity_scores(t)["compound"] if _scorable(t) else 0.0 for t in texts]
+    # labels from the unrounded scores, so none flips at the thresholds
+    labels = [_label(c) for c in compounds]
+    return np.array(compounds, dtype=np.float32), labels
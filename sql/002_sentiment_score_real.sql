@@ -0,0 +1,7 @@
+-- 002_sentiment_score_real.sql
+
+-- VADER compound scores live in [-1, 1] rounded to 4 decimals, so single
+-- precision is enough. Halves the column's storage and matches the float32
+-- the dashboard works in.
+alter table posts
+  alter column sentiment_score type real using sentiment_score::real;
@@ -0,0 +1,31 @@
+-- 003_sentiment_timeline.sql
+
+-- Average sentiment and post volume per time bucket for a dashboard query.
+-- Mirrors the filters in the app's fetch_posts so the dashboard can pull
+-- ~100 aggregated rows instead of the raw posts.
+--   select * from sentiment_timeline('openai', array['reddit'], now() - interval '24 hours', interval '15 minutes');
+create or replace function sentiment_timeline(
+  kw text,
+  src text[],
+  start_ts timestamptz,
+  bucket interval
+)
+returns table (created_at timestamptz, avg_sentiment double precision, volume bigint)
+language sql stable
+as $$
+  select
+    date_bin(bucket, p.created_at, timestamptz '2000-01-01') as created_at,
+    avg(coalesce(p.sentiment_score, 0)) as avg_sentiment,
+    count(*) as volume
+  from posts p
+  where p.created_at >= start_ts
+    and (src is null or cardinality(src) = 0 or p.source = any(src))
+    and (
+      coalesce(kw, '') = ''
+      or p.title ilike '%' || kw || '%'
+      or p.body ilike '%' || kw || '%'
+      or p.keyword ilike '%' || kw || '%'
+    )
+  group by 1
+  order by 1;
+$$;
@@ -0,0 +1,57 @@
+-- 004_posts_full_text_search.sql
+
+-- Full-text search over posts. The dashboard matches keywords against this
+-- column with websearch_to_tsquery (PostgREST's wfts operator), which the GIN
+-- index serves directly instead of scanning every row with ilike '%kw%'.
+-- The keyword column is included so posts collected for a term keep matching it.
+alter table posts
+  add column if not exists search_tsv tsvector
+  generated always as (
+    to_tsvector(
+      'english',
+      coalesce(title, '') || ' ' || coalesce(body, '') || ' ' || coalesce(keyword, '')
+    )
+  ) stored;
+
+create index if not exists posts_search_gin on posts using gin (search_tsv);
+
+-- Posts are appended roughly in created_at order, so a BRIN index narrows the
+-- timeframe filter for a fraction of the btree's size.
+create index if not exists posts_created_at_brin on posts using brin (created_at);
+
+-- Keep the timeline RPC's keyword semantics in line with the app: full-text
+-- match, with ilike only for keywords containing wildcards.
+create or replace function sentiment_timeline(
+  kw text,
+  src text[],
+  start_ts timestamptz,
+  bucket interval
+)
+returns table (created_at timestamptz, avg_sentiment double precision, volume bigint)
+language sql stable
+as $$
+  select
+    date_bin(bucket, p.created_at, timestamptz '2000-01-01') as created_at,
+    avg(coalesce(p.sentiment_score, 0)) as avg_sentiment,
+    count(*) as volume
+  from posts p
+  where p.created_at >= start_ts
+    and (src is null or cardinality(src) = 0 or p.source = any(src))
+    and (
+      coalesce(kw, '') = ''
+      or (
+        kw !~ '[%_*]'
+        and p.search_tsv @@ websearch_to_tsquery('english', kw)
+      )
+      or (
+        kw ~ '[%_*]'
+        and (
+          p.title ilike '%' || kw || '%'
+          or p.body ilike '%' || kw || '%'
+          or p.keyword ilike '%' || kw || '%'
+        )
+      )
+    )
+  group by 1
+  order by 1;
+$$;
@@ -0,0 +1,58 @@
+-- 005_dashboard_kpis.sql
+
+-- Everything the dashboard's KPI cards show, computed in one query over the
+-- same posts the app lists (filters mirror fetch_posts and sentiment_timeline).
+-- last_volume / prev_volume are the post counts of the newest bucket that has
+-- posts and of the bucket before it.
+--   select * from dashboard_kpis('openai', array['reddit'], now() - interval '24 hours', interval '15 minutes');
+create or replace function dashboard_kpis(
+  kw text,
+  src text[],
+  start_ts timestamptz,
+  bucket interval
+)
+returns table (
+  total_posts bigint,
+  avg_sentiment double precision,
+  top_subreddit text,
+  last_volume bigint,
+  prev_volume bigint
+)
+language sql stable
+as $$
+  with matched as (
+    select
+      p.sentiment_score,
+      p.metadata->>'subreddit' as subreddit,
+      date_bin(bucket, p.created_at, timestamptz '2000-01-01') as bkt
+    from posts p
+    where p.created_at >= start_ts
+      and (src is null or cardinality(src) = 0 or p.source = any(src))
+      and (
+        coalesce(kw, '') = ''
+        or (
+          kw !~ '[%_*]'
+          and p.search_tsv @@ websearch_to_tsquery('english', kw)
+        )
+        or (
+          kw ~ '[%_*]'
+          and (
+            p.title ilike '%' || kw || '%'
+            or p.body ilike '%' || kw || '%'
+            or p.keyword ilike '%' || kw || '%'
+          )
+        )
+      )
+  ),
+  latest as (
+    select max(bkt) as bkt from matched
+  )
+  select
+    count(*) as total_posts,
+    avg(m.sentiment_score) as avg_sentiment,
+    mode() within group (order by m.subreddit) as top_subreddit,
+    count(*) filter (where m.bkt = l.bkt) as last_volume,
+    count(*) filter (where m.bkt = l.bkt - bucket) as prev_volume
+  from matched m
+  cross join latest l;
+$$;
@@ -0,0 +1,12 @@
+-- 006_posts_keyset_indexes.sql
+
+-- The dashboard lists posts newest first and pages with a (created_at, id)
+-- keyset cursor, so every page is an index range scan in that order no matter
+-- how deep it is. Keyword matching goes through posts_search_gin (004), so the
+-- btree leads with source (the other equality filter) rather than keyword.
+create index if not exists posts_source_created_at_id_idx
+  on posts (source, created_at desc, id desc);
+
+-- Same ordering for queries across all sources.
+create index if not exists posts_created_at_id_idx
+  on posts (created_at desc, id desc);
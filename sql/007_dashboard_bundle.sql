@@ -0,0 +1,130 @@
+-- 007_dashboard_bundle.sql
+
+-- Posts matching a dashboard query: the filters fetch_posts applies through
+-- PostgREST (full-text match, ilike for wildcard keywords, optional sources).
+-- A plain SQL function, so Postgres inlines it and still uses the indexes.
+create or replace function matching_posts(
+  kw text,
+  src text[],
+  start_ts timestamptz
+)
+returns setof posts
+language sql stable
+as $$
+  select p.*
+  from posts p
+  where p.created_at >= start_ts
+    and (src is null or cardinality(src) = 0 or p.source = any(src))
+    and (
+      coalesce(kw, '') = ''
+      or (
+        kw !~ '[%_*]'
+        and p.search_tsv @@ websearch_to_tsquery('english', kw)
+      )
+      or (
+        kw ~ '[%_*]'
+        and (
+          p.title ilike '%' || kw || '%'
+          or p.body ilike '%' || kw || '%'
+          or p.keyword ilike '%' || kw || '%'
+        )
+      )
+    );
+$$;
+
+-- The timeline and KPI RPCs (sql/004, sql/005) read the same rows, so the
+-- filters above are the only copy there is to keep in line with fetch_posts.
+create or replace function sentiment_timeline(
+  kw text,
+  src text[],
+  start_ts timestamptz,
+  bucket interval
+)
+returns table (created_at timestamptz, avg_sentiment double precision, volume bigint)
+language sql stable
+as $$
+  select
+    date_bin(bucket, p.created_at, timestamptz '2000-01-01') as created_at,
+    avg(coalesce(p.sentiment_score, 0)) as avg_sentiment,
+    count(*) as volume
+  from matching_posts(kw, src, start_ts) p
+  group by 1
+  order by 1;
+$$;
+
+create or replace function dashboard_kpis(
+  kw text,
+  src text[],
+  start_ts timestamptz,
+  bucket interval
+)
+returns table (
+  total_posts bigint,
+  avg_sentiment double precision,
+  top_subreddit text,
+  last_volume bigint,
+  prev_volume bigint
+)
+language sql stable
+as $$
+  with matched as (
+    select
+      p.sentiment_score,
+      p.metadata->>'subreddit' as subreddit,
+      date_bin(bucket, p.created_at, timestamptz '2000-01-01') as bkt
+    from matching_posts(kw, src, start_ts) p
+  ),
+  latest as (
+    select max(bkt) as bkt from matched
+  )
+  select
+    count(*) as total_posts,
+    avg(m.sentiment_score) as avg_sentiment,
+    mode() within group (order by m.subreddit) as top_subreddit,
+    count(*) filter (where m.bkt = l.bkt) as last_volume,
+    count(*) filter (where m.bkt = l.bkt - bucket) as prev_volume
+  from matched m
+  cross join latest l;
+$$;
+
+-- Everything the dashboard needs for first paint in one round trip: the newest
+-- posts (same columns as the app's POST_COLUMNS), the timeline, the KPI row
+-- and the latest alerts.
+create or replace function dashboard_bundle(
+  kw text,
+  src text[],
+  start_ts timestamptz,
+  bucket interval,
+  post_limit int default 500
+)
+returns json
+language sql stable
+as $$
+  select json_build_object(
+    'posts', coalesce((
+      select json_agg(r)
+      from (
+        select
+          p.id, p.title, p.body, p.source, p.author, p.url, p.score,
+          p.created_at, p.sentiment_score::float4 as sentiment_score,
+          p.sentiment_label, p.metadata->>'subreddit' as subreddit
+        from matching_posts(kw, src, start_ts) p
+        order by p.created_at desc, p.id desc
+        limit post_limit
+      ) r
+    ), '[]'::json),
+    'timeline', coalesce((
+      select json_agg(t order by t.created_at)
+      from sentiment_timeline(kw, src, start_ts, bucket) t
+    ), '[]'::json),
+    'kpis', (
+      select row_to_json(k) from dashboard_kpis(kw, src, start_ts, bucket) k
+    ),
+    'alerts', coalesce((
+      select json_agg(a)
+      from (
+        select * from alerts order by triggered_at desc limit 10
+      ) a
+    ), '[]'::json)
+  );
+$$;